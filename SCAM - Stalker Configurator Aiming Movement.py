@@ -1,10 +1,1927 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+from tkinter import ttk, messagebox, simpledialog, filedialog
 import configparser
 import subprocess
 from pathlib import Path
 import os
+import sys
 import shutil
+import argparse
+import glob
+import tempfile
+import time
+import hashlib
+import struct
+import json
+import bisect
+import contextlib
+import threading
+import queue
+import mmap
+import re
+import zlib
+import math
+from collections import OrderedDict
+from decimal import Decimal
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+DEFAULT_INI = 'default_ini/default_values.ini'
+MOD_NAME = 'z_SCAMMovementAiming_P'
+SCHEMA_CACHE = '.schema_cache.json'
+PRESET_DIR = 'custom_ini'
+BUILTIN_PRESET_DIR = 'default_ini'
+PRESET_INDEX = '.index.json'
+PRESET_CACHE_SIZE = 64
+# Characters and endings Windows doesn't allow in file names, ':' also marks key:/tag: searches
+INVALID_PRESET_NAME = re.compile(r'[<>:"/\\|?*\x00-\x1f]|[. ]$')
+# Optional section of a preset INI holding metadata such as Tags, never written to the mod
+PRESET_META_SECTION = 'Preset'
+MOD_CFG_DIR = 'Stalker2/Content/GameLite/GameData/ObjPrototypes'
+REPAK_PATH = 'repak/repak.exe'
+MOD_CFG_PATH = f'{MOD_CFG_DIR}/SCAM.cfg'
+
+# Pak layout written by PakWriter, matching repak's pack defaults (version V8B, no compression)
+PAK_MAGIC = 0x5A6F12E1
+PAK_VERSION = 8
+PAK_MOUNT_POINT = '../../../'
+PAK_COMPRESSION_SLOTS = 5
+CFG_INDENT = '   '
+# (footer size, compression name slots) of every pak version PakReader can open, largest first
+PAK_FOOTER_LAYOUTS = [(222, 5), (221, 5), (189, 4), (61, 0), (45, 0), (44, 0)]
+
+# Set to a file path to record timing spans, SCAM_TRACE_FORMAT picks json (default) or chrome
+TRACE_ENV = 'SCAM_TRACE'
+TRACE_FORMAT_ENV = 'SCAM_TRACE_FORMAT'
+
+# Extracted game data used for true defaults, and where its prototype offsets are cached
+GAME_DATA_ENV = 'SCAM_GAME_DATA'
+GAME_PROTOTYPES_CFG = 'Stalker2/Content/GameLite/GameData/ObjPrototypes.cfg'
+GAME_PROTOTYPE = 'Player'
+PROTOTYPE_INDEX = '.prototype_index.json'
+# Per-pak results of the ~mods conflict scanner, keyed by path and reused while size and mtime match
+SCAN_CACHE = '.scan_cache.json'
+
+# How often the editor checks background builds for progress
+BUILD_POLL_MS = 100
+
+# Watch mode: seconds between polls of the preset folders, and how long a change must be quiet
+WATCH_INTERVAL = 0.2
+WATCH_DEBOUNCE = 0.3
+
+BENCH_SIZES = [10, 100, 1000, 10000, 100000]
+BENCH_SECTION_SIZE = 100
+# Bump whenever the cfg or pak output changes so stale cache entries are never reused
+PACKER_VERSION = 2
+
+BUILD_CACHE_DIR = '.build_cache'
+BUILD_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# MovementParams keys shown on the Aiming tab instead of the MovementParams tab
+AIMING_KEYS = ['BaseTurnRate', 'BaseLookUpRate']
+# Number of rows a tab builds at a time as it is scrolled into view
+ROW_CHUNK = 40
+
+# Hard limits of the fields that have one, checked by the editor, batch builds and sweeps.
+# Every other field takes any finite number.
+DEFAULT_RANGE = (-float('inf'), float('inf'))
+FIELD_RANGES = {
+    ('VaultingParams', 'MaxAngle'): (0, 180),
+    ('VaultingParams', 'LandingMaxSlope'): (0, 90),
+    ('VaultingParams', 'MinForwardAxisInputValue'): (0, 1),
+}
+# Sweeps stay within sensible values on top of that: the speed and control coefficients as
+# fractions, everything else not negative
+SWEEP_DEFAULT_RANGE = (0, float('inf'))
+SWEEP_RANGES = {('MovementParams', key): (0, 1) for key in [
+    'ClimbSpeedCoef', 'JumpSpeedCoef', 'LimpSpeedCoef', 'RunDiagonalBackCoef', 'WalkDiagonalBackCoef',
+    'WalkBackCoef', 'RunBackCoef', 'MoveBackCrouchCoef', 'MoveBackLowCrouchCoef', 'AirControlCoef']}
+# Fields that only take whole numbers
+INTEGER_FIELDS = {('MovementParams', key) for key in AIMING_KEYS} | {
+    ('VaultingParams', 'MaxWindowDetectionIterations'), ('VaultingParams', 'MaxLandingDetectionIterations')}
+# (low, high) pairs where low may not exceed high
+CROSS_FIELD_RULES = [
+    (('VaultingParams', 'MinObstacleHeight'), ('VaultingParams', 'MaxObstacleHeight')),
+]
+
+
+class Tracer:
+    # Opt-in recorder of nested timing spans and byte counts, exported as JSON or a Chrome trace.
+    # It is switched on through the SCAM_TRACE environment variable so worker processes inherit it.
+    def __init__(self):
+        self.enabled = False
+        self.spans = []
+        self.local = threading.local()
+
+    def span(self, name, **args):
+        if not self.enabled:
+            return NULL_SPAN
+        return self.record(name, args)
+
+    @contextlib.contextmanager
+    def record(self, name, args):
+        stack = self.local.__dict__.setdefault('stack', [])
+        span = {'name': name, 'parent': stack[-1]['name'] if stack else None, 'depth': len(stack),
+                'start': time.time(), 'duration': 0.0, 'bytes': 0, 'args': args,
+                'pid': os.getpid(), 'tid': threading.get_ident()}
+        stack.append(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span['duration'] = time.perf_counter() - start
+            stack.pop()
+            self.spans.append(span)
+
+    def add_bytes(self, count):
+        stack = self.local.__dict__.get('stack')
+        if self.enabled and stack:
+            stack[-1]['bytes'] += count
+
+    def export(self, path, format='json'):
+        spans = sorted(self.spans, key=lambda span: span['start'])
+        if format == 'chrome':
+            data = {'displayTimeUnit': 'ms', 'traceEvents': [
+                {'name': span['name'], 'ph': 'X', 'pid': span['pid'], 'tid': span['tid'],
+                 'ts': span['start'] * 1e6, 'dur': span['duration'] * 1e6,
+                 'args': dict(span['args'], bytes=span['bytes'])} for span in spans]}
+        else:
+            data = {'spans': spans}
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=1)
+
+
+NULL_SPAN = contextlib.nullcontext()
+tracer = Tracer()
+tracer.enabled = bool(os.environ.get(TRACE_ENV))
+
+
+INTEGER_TEXT = re.compile(r'[+-]?\d+\Z')
+NUMBER_TEXT = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\Z')
+
+
+# The parsers return None instead of raising, so a bad keystroke costs one regex match
+def parse_bool(text):
+    lowered = text.strip().lower()
+    return lowered == 'true' if lowered in ['true', 'false'] else None
+
+
+def parse_integer(text):
+    text = text.strip()
+    return int(text) if INTEGER_TEXT.match(text) else None
+
+
+def parse_number(text):
+    # Whole numbers stay ints, any other decimal or exponent form (0.5, 5., 1e-3) becomes a float
+    text = text.strip()
+    if INTEGER_TEXT.match(text):
+        return int(text)
+    if NUMBER_TEXT.match(text):
+        return float(text)
+    return None
+
+
+def parse_value(value):
+    # Untyped guess, used to infer field types from default_values.ini
+    parsed = parse_bool(value)
+    if parsed is None:
+        parsed = parse_number(value)
+    return value if parsed is None else parsed
+
+
+def format_value(value):
+    # Canonical text of a value in presets and cfgs: floats in plain decimal notation, never 1e-05
+    if isinstance(value, float) and math.isfinite(value):
+        return format(Decimal(repr(value)), 'f')
+    return str(value)
+
+
+class FieldValidator:
+    # Parser, allowed range and canonical formatter of one field, picked once when the schema
+    # is built. parse() only converts the text, validate() also applies the range.
+    __slots__ = ('parse', 'low', 'high', 'format')
+
+    def __init__(self, field):
+        self.low = self.high = None
+        self.format = format_value
+        if field.type is bool:
+            self.parse = parse_bool
+            self.format = str
+        elif field.type in [int, float]:
+            # Fields that look like ints in default_values.ini still take floats, unless listed
+            self.parse = parse_integer if (field.section, field.key) in INTEGER_FIELDS else parse_number
+            self.low, self.high = field_range(field.section, field.key)
+        else:
+            self.parse = parse_value
+
+    def validate(self, text):
+        value = self.parse(text)
+        if value is None or self.low is None:
+            return value
+        if not math.isfinite(value) or not self.low <= value <= self.high:
+            return None
+        return value
+
+
+class FieldSpec:
+    __slots__ = ('section', 'key', 'type', 'default', 'description')
+
+    def __init__(self, section, key, type, default, description=''):
+        self.section = section
+        self.key = key
+        self.type = type
+        self.default = default
+        self.description = description
+
+
+FIELD_TYPES = {'bool': bool, 'int': int, 'float': float, 'str': str}
+
+
+class Schema:
+    # Typed view of default_values.ini: one FieldSpec per key, in file order
+    def __init__(self, fields):
+        self.fields = fields
+        self.index = {(field.section, field.key): field for field in fields}
+        self.validators = {key: FieldValidator(field) for key, field in self.index.items()}
+
+    def defaults(self):
+        default_config = {}
+        descriptions = {}
+        for field in self.fields:
+            default_config.setdefault(field.section, {})[field.key] = field.default
+            section_descriptions = descriptions.setdefault(field.section, {})
+            if field.description:
+                section_descriptions[field.key] = field.description
+        return default_config, descriptions
+
+    def with_defaults(self, defaults):
+        fields = []
+        for field in self.fields:
+            default = defaults.get((field.section, field.key), field.default)
+            fields.append(FieldSpec(field.section, field.key, field.type, default, field.description))
+        return Schema(fields)
+
+    def parse(self, section, key, value):
+        # Typed value of a known field, or the text itself when it doesn't parse
+        validator = self.validators.get((section, key))
+        parsed = validator.parse(value) if validator else parse_value(value)
+        return value if parsed is None else parsed
+
+    def invalid_fields(self, config):
+        # Every section/key of a loaded preset whose value fails its field's checks, in one pass
+        return [(section, key) for section, values in config.items() for key, value in values.items()
+                if (section, key) in self.validators and self.validators[(section, key)].validate(str(value)) is None]
+
+    def to_json(self):
+        return [[f.section, f.key, f.type.__name__, f.default, f.description] for f in self.fields]
+
+    @classmethod
+    def from_json(cls, data):
+        return cls([FieldSpec(section, key, FIELD_TYPES[type_name], default, description)
+                    for section, key, type_name, default, description in data])
+
+
+def read_ini_sections(filename):
+    config = configparser.ConfigParser()
+    config.optionxform = str
+    config.read(filename)
+    for section in config.sections():
+        for key, value in config.items(section):
+            if key.startswith(';'):
+                continue
+            yield section, key, value
+
+
+def compile_schema(filename):
+    fields = []
+    for section, key, value in read_ini_sections(filename):
+        parts = value.split(';', 1)
+        default = parse_value(parts[0].strip())
+        description = parts[1].strip() if len(parts) > 1 else ''
+        fields.append(FieldSpec(section, key, type(default), default, description))
+    return Schema(fields)
+
+
+def read_json(path):
+    # Contents of a JSON cache file, empty when it is missing or unreadable
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def write_json_atomic(path, data):
+    # Writes next to path and swaps it in, so readers never see half a file. Caches only
+    # speed things up, a failed write just leaves the old one (or none) in place.
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+_schemas = {}
+
+
+def load_schema(filename=DEFAULT_INI, cache_file=SCHEMA_CACHE):
+    # Compiled schemas are kept in memory and in cache_file, keyed by the INI's
+    # mtime and size, with a content hash as fallback when only the mtime moved
+    stat = os.stat(filename)
+    stamp = [stat.st_mtime_ns, stat.st_size]
+    path = os.path.abspath(filename)
+    if path in _schemas and _schemas[path][0] == stamp:
+        return _schemas[path][1]
+
+    cache = read_json(cache_file)
+
+    schema = None
+    entry = cache.get(path)
+    if entry and entry['stamp'] == stamp:
+        schema = Schema.from_json(entry['fields'])
+    else:
+        with open(filename, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        if entry and entry['sha1'] == digest:
+            schema = Schema.from_json(entry['fields'])
+        else:
+            with tracer.span('compile_schema', file=str(filename)):
+                schema = compile_schema(filename)
+        cache[path] = {'stamp': stamp, 'sha1': digest, 'fields': schema.to_json()}
+        write_json_atomic(cache_file, cache)
+
+    _schemas[path] = (stamp, schema)
+    return schema
+
+
+def load_ini_file(filename, schema=None):
+    schema = schema or load_schema()
+    result = {}
+    with tracer.span('load_ini_file', file=str(filename)):
+        if tracer.enabled and os.path.exists(filename):
+            tracer.add_bytes(os.path.getsize(filename))
+        for section, key, value in read_ini_sections(filename):
+            result.setdefault(section, {})[key] = schema.parse(section, key, value.split(';')[0].strip())
+    return result
+
+
+STRUCT_LINE = re.compile(rb'^[ \t]*(?:([^\s:]+)[ \t]*:[ \t]*struct\.begin([^\r\n]*)|struct\.end)', re.M)
+
+
+def parse_struct_attributes(text):
+    # "{refurl=../ObjPrototypes.cfg; refkey=Player}" -> {'refurl': ..., 'refkey': ...}
+    attributes = {}
+    text = text.strip()
+    if text.startswith('{') and '}' in text:
+        for item in text[1:text.index('}')].split(';'):
+            if '=' in item:
+                key, value = item.split('=', 1)
+                attributes[key.strip()] = value.strip()
+    return attributes
+
+
+def parse_struct_body(text):
+    # Lines of a struct.begin/struct.end block, without its own begin and end lines, as nested dicts
+    root = {}
+    stack = [root]
+    for line in text.splitlines():
+        line = line.split('//', 1)[0].strip()
+        if not line:
+            continue
+        if line == 'struct.end':
+            if len(stack) > 1:
+                stack.pop()
+        elif ':' in line and 'struct.begin' in line:
+            child = {}
+            stack[-1][line.split(':', 1)[0].strip()] = child
+            stack.append(child)
+        elif '=' in line:
+            key, value = line.split('=', 1)
+            stack[-1][key.strip()] = value.strip()
+    return root
+
+
+def merge_structs(base, override):
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_structs(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class PrototypeIndex:
+    # Offset index over Stalker 2 struct.begin/struct.end cfg files. Each file is memory-mapped and
+    # scanned once for the byte range of every struct path; the ranges are persisted in index_file
+    # and reused until the cfg's size or mtime changes. Prototypes are only parsed when asked for,
+    # and refkey/refurl inheritance is followed lazily from there.
+    def __init__(self, index_file=PROTOTYPE_INDEX):
+        self.index_file = index_file
+        self.files = read_json(index_file)
+        self.maps = {}
+        self.resolved = {}
+
+    def mapped(self, path):
+        if path not in self.maps:
+            with open(path, 'rb') as f:
+                self.maps[path] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.maps[path]
+
+    @staticmethod
+    def scan(data):
+        structs = {}
+        prototypes = {}
+        stack = []
+        for match in STRUCT_LINE.finditer(data):
+            if match.group(1) is not None:
+                name = match.group(1).decode('utf-8', 'replace')
+                stack.append((name, match.start(), match.end()))
+                if len(stack) == 1:
+                    attributes = parse_struct_attributes(match.group(2).decode('utf-8', 'replace'))
+                    prototypes[name] = [attributes.get('refurl'), attributes.get('refkey')]
+            elif stack:
+                path = '/'.join(name for name, _, _ in stack)
+                _, start, body_start = stack.pop()
+                # Whole block for the prototype, body only (after the begin line) for lookups
+                structs[path] = [start, body_start, match.start()]
+        return structs, prototypes
+
+    def index(self, path):
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        entry = self.files.get(path)
+        if entry and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return entry
+
+        # The file changed: an old map holds stale bytes (or faults past a truncated end), and
+        # prototypes in any file may inherit from this one
+        if path in self.maps:
+            self.maps.pop(path).close()
+        self.resolved = {}
+        with tracer.span('index_prototypes', file=path):
+            structs, prototypes = self.scan(self.mapped(path)) if stat.st_size else ({}, {})
+            tracer.add_bytes(stat.st_size)
+        entry = {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'structs': structs, 'prototypes': prototypes}
+        self.files[path] = entry
+        write_json_atomic(self.index_file, self.files)
+        return entry
+
+    def struct(self, path, struct_path):
+        # Own values of one struct (e.g. "Player/MovementParams"), without inheritance
+        entry = self.index(path)
+        if struct_path not in entry['structs']:
+            return None
+        _, body_start, end = entry['structs'][struct_path]
+        return parse_struct_body(self.mapped(os.path.abspath(path))[body_start:end].decode('utf-8', 'replace'))
+
+    def resolve(self, path, name, seen=()):
+        # The prototype's values merged over those of the prototype its refkey/refurl points at
+        path = os.path.abspath(path)
+        if not seen:
+            # Re-stat every indexed cfg first, a change to any of them drops all resolved prototypes
+            for known in list(self.files):
+                if known != path and os.path.exists(known):
+                    self.index(known)
+        entry = self.index(path)
+        if (path, name) in self.resolved:
+            return self.resolved[(path, name)]
+        if name not in entry['prototypes']:
+            raise KeyError(f"Prototype '{name}' not found in {path}")
+
+        values = self.struct(path, name)
+        refurl, refkey = entry['prototypes'][name]
+        # refkey=[0] style references point into arrays and have nothing to inherit here
+        if refkey and not refkey.startswith('['):
+            base_path = path
+            if refurl:
+                candidate = os.path.normpath(os.path.join(os.path.dirname(path), refurl))
+                if os.path.exists(candidate):
+                    base_path = candidate
+            if (base_path, refkey) != (path, name) and (base_path, refkey) not in seen:
+                try:
+                    base = self.resolve(base_path, refkey, seen + ((path, name),))
+                    values = merge_structs(base, values)
+                except KeyError:
+                    pass
+        self.resolved[(path, name)] = values
+        return values
+
+
+def find_prototypes_cfg(game_data):
+    # Accepts the extracted game root, its GameData folder or the cfg itself
+    for candidate in [game_data, os.path.join(game_data, 'ObjPrototypes.cfg'),
+                      os.path.join(game_data, GAME_PROTOTYPES_CFG)]:
+        if os.path.isfile(candidate):
+            return candidate
+    raise FileNotFoundError(f"ObjPrototypes.cfg not found under {game_data}")
+
+
+_prototype_indexes = {}
+
+
+def game_defaults(game_data, schema, prototype=GAME_PROTOTYPE):
+    # Values of the schema's fields as the game's prototype defines them
+    path = find_prototypes_cfg(game_data)
+    index = _prototype_indexes.setdefault(PROTOTYPE_INDEX, PrototypeIndex())
+    values = index.resolve(path, prototype)
+    defaults = {}
+    for field in schema.fields:
+        value = values.get(field.section, {}).get(field.key)
+        if isinstance(value, str):
+            if field.type is not bool and value.lower().endswith('f'):
+                value = value[:-1]
+            value = schema.parse(field.section, field.key, value)
+            # Keep the field's type so integer fields still display without a decimal point
+            if field.type is float and isinstance(value, int) and not isinstance(value, bool):
+                value = float(value)
+            if isinstance(value, field.type) or (field.type is int and isinstance(value, float)):
+                defaults[(field.section, field.key)] = value
+    return defaults
+
+
+def load_effective_schema(filename=DEFAULT_INI, game_data=None):
+    # default_values.ini, with the defaults read from the game's own Player prototype when the
+    # extracted game data is configured (--game-data or SCAM_GAME_DATA)
+    schema = load_schema(filename)
+    game_data = game_data or os.environ.get(GAME_DATA_ENV)
+    if game_data:
+        schema = schema.with_defaults(game_defaults(game_data, schema))
+    return schema
+
+
+def compute_overrides(default_config, config, schema=None):
+    # Returns the section/key values of config that differ from the defaults,
+    # comparing the same way the editor does (text for numbers, bool for flags).
+    # Changed values are checked with the schema's validators when one is given.
+    overrides = {}
+    for section in default_config:
+        if section == 'Aiming':  # Skip Aiming section for mod creation
+            continue
+        current = config.get(section, {})
+        changed_values = {}
+        for key, default_value in default_config[section].items():
+            if key not in current:
+                continue
+            value = current[key]
+            validator = schema.validators.get((section, key)) if schema else None
+            if isinstance(default_value, bool):
+                # A flag that didn't parse ("yes") is kept as text by the loader and must not reach the cfg
+                value = validator.validate(str(value)) if validator else parse_bool(str(value))
+                if value is None:
+                    raise ValueError(f"Invalid value for {key}!")
+                if value != default_value:
+                    changed_values[key] = value
+            elif str(value) != str(default_value):
+                value = validator.validate(str(value)) if validator else parse_number(str(value))
+                if value is None:
+                    raise ValueError(f"Invalid value for {key}!")
+                changed_values[key] = value
+        if changed_values:
+            overrides[section] = changed_values
+    return overrides
+
+
+class ConfigModel:
+    # Current value of every schema field plus the sets of modified and invalid keys.
+    # set() keeps both sets up to date, so change and validity checks never rescan the fields.
+    def __init__(self, schema):
+        self.schema = schema
+        self.validators = schema.validators
+        self.order = {}
+        self.defaults = {}
+        for index, field in enumerate(schema.fields):
+            key = (field.section, field.key)
+            self.order[key] = index
+            self.defaults[key] = field.default if field.type is bool else str(field.default)
+        self.values = dict(self.defaults)
+        self.modified = set()
+        self.invalid = set()
+
+    def __contains__(self, key):
+        return key in self.values
+
+    def get(self, section, key):
+        return self.values[(section, key)]
+
+    def set(self, section, key, value):
+        field = (section, key)
+        self.values[field] = value
+        if value != self.defaults[field]:
+            self.modified.add(field)
+        else:
+            self.modified.discard(field)
+        if self.check(field, value):
+            self.invalid.discard(field)
+        else:
+            self.invalid.add(field)
+
+    def check(self, field, value):
+        if isinstance(value, bool) or (value and value == self.defaults[field]):
+            return True
+        return self.validators[field].validate(value) is not None
+
+    def changes(self, config):
+        # Smallest set of updates turning the current values into the defaults overlaid with config.
+        # Fields that are neither modified now nor named by config already hold their default.
+        target = {field: self.defaults[field] for field in self.modified}
+        for section, values in config.items():
+            for key, value in values.items():
+                if (section, key) in self.values:
+                    target[(section, key)] = value if isinstance(value, bool) else str(value)
+        return {field: value for field, value in target.items() if self.values[field] != value}
+
+    def is_valid(self, section, key):
+        return (section, key) not in self.invalid
+
+    def is_modified(self, section, key):
+        return (section, key) in self.modified
+
+    def has_changes(self):
+        return bool(self.modified)
+
+    def has_invalid(self):
+        return bool(self.invalid)
+
+    def overrides(self):
+        # Same result as compute_overrides over all values, built from the modified keys only
+        config = {}
+        for section, key in sorted(self.modified, key=self.order.get):
+            if section == 'Aiming':  # Skip Aiming section for mod creation
+                continue
+            value = self.values[(section, key)]
+            if not isinstance(value, bool):
+                value = self.validators[(section, key)].validate(value)
+                if value is None:
+                    raise ValueError(f"Invalid value for {key}!")
+            config.setdefault(section, {})[key] = value
+        return config
+
+
+def player_prototype(config):
+    # The struct SCAM has always generated: the player prototype with config as its sections
+    return ('CustomPlayer', {'refurl': '../ObjPrototypes.cfg', 'refkey': 'Player'}, config)
+
+
+def iter_struct_lines(name, attributes, body, depth=0):
+    indent = CFG_INDENT * depth
+    header = f"{indent}{name} : struct.begin"
+    if attributes:
+        header += " {" + "; ".join(f"{key}={value}" for key, value in attributes.items()) + "}"
+    yield header
+    for key, value in body.items():
+        if isinstance(value, dict):
+            yield from iter_struct_lines(key, None, value, depth + 1)
+        else:
+            yield f"{indent}{CFG_INDENT}{key} = {format_value(value)}"
+    yield f"{indent}struct.end"
+
+
+def iter_cfg_lines(prototypes):
+    # prototypes is a sequence of (name, attributes, body) tuples. Dict values in a body become
+    # nested structs, everything else a key = value line, both in the body's own order.
+    for name, attributes, body in prototypes:
+        yield from iter_struct_lines(name, attributes, body)
+
+
+def iter_cfg_chunks(prototypes, newline='\r\n'):
+    # The game ships its cfgs with Windows line endings, so emit those on every host.
+    # Lines are separated, not terminated, which keeps the file ending on struct.end.
+    separator = ''
+    for line in iter_cfg_lines(prototypes):
+        yield (separator + line).encode('utf-8')
+        separator = newline
+
+
+def write_cfg(fileobj, cfg_chunks):
+    # cfg_chunks as iter_cfg_chunks yields them, possibly wrapped by cancellable()
+    for chunk in cfg_chunks:
+        fileobj.write(chunk)
+
+
+def pak_string(value):
+    try:
+        data = value.encode('ascii') + b'\0'
+        return struct.pack('<i', len(data)) + data
+    except UnicodeEncodeError:
+        data = value.encode('utf-16-le') + b'\0\0'
+        return struct.pack('<i', -(len(data) // 2)) + data
+
+
+def pak_entry_record(offset, size, sha1):
+    # offset, compressed size, uncompressed size, compression slot, hash, encrypted, block size
+    return struct.pack('<QQQI', offset, size, size, 0) + sha1 + struct.pack('<?I', False, 0)
+
+
+class PakWriter:
+    # Writes an uncompressed Unreal .pak straight to a file object. The data records,
+    # index and footer are laid out exactly as `repak pack` lays them out.
+    def __init__(self, fileobj, mount_point=PAK_MOUNT_POINT):
+        self.file = fileobj
+        self.mount_point = mount_point
+        self.index = {}
+
+    def add_entry(self, path, data):
+        offset = self.file.tell()
+        sha1 = hashlib.sha1(data).digest()
+        # Data records carry a zero offset, only the index stores the real one
+        self.file.write(pak_entry_record(0, len(data), sha1))
+        self.file.write(data)
+        self.index[path] = pak_entry_record(offset, len(data), sha1)
+
+    def add_entry_chunks(self, path, chunks):
+        # Streams an entry whose size and hash aren't known up front: the record is written
+        # as a placeholder and patched once the data is in place
+        offset = self.file.tell()
+        record_size = len(pak_entry_record(0, 0, bytes(20)))
+        self.file.write(bytes(record_size))
+        sha1 = hashlib.sha1()
+        size = 0
+        for chunk in chunks:
+            sha1.update(chunk)
+            size += len(chunk)
+            self.file.write(chunk)
+        end = self.file.tell()
+        self.file.seek(offset)
+        self.file.write(pak_entry_record(0, size, sha1.digest()))
+        self.file.seek(end)
+        self.index[path] = pak_entry_record(offset, size, sha1.digest())
+
+    def finish(self):
+        index = bytearray(pak_string(self.mount_point))
+        index += struct.pack('<I', len(self.index))
+        for path in sorted(self.index):
+            index += pak_string(path)
+            index += self.index[path]
+
+        index_offset = self.file.tell()
+        self.file.write(index)
+        footer = bytes(16)  # encryption key guid
+        footer += struct.pack('<?IIQQ', False, PAK_MAGIC, PAK_VERSION, index_offset, len(index))
+        footer += hashlib.sha1(index).digest()
+        footer += bytes(32 * PAK_COMPRESSION_SLOTS)
+        self.file.write(footer)
+
+
+def write_pak(output, entries):
+    # entries maps pak paths to file contents, either bytes or an iterable of byte chunks.
+    # repak adds files in directory walk order.
+    with tracer.span('write_pak', output=str(output)), open(output, 'wb') as f:
+        writer = PakWriter(f)
+        for path in sorted(entries, key=lambda p: p.split('/')):
+            if isinstance(entries[path], bytes):
+                writer.add_entry(path, entries[path])
+            else:
+                writer.add_entry_chunks(path, entries[path])
+        writer.finish()
+        tracer.add_bytes(f.tell())
+
+
+def pak_footer_size(version, compression_slots):
+    if version < 4:
+        return 44
+    if version < 7:
+        return 45
+    if version == 7:
+        return 61
+    # V8A has four compression name slots, V8B and later five; V9 adds the frozen index flag
+    return 61 + 32 * compression_slots + (1 if version == 9 else 0)
+
+
+class PakReader:
+    # Reads single entries out of an Unreal .pak without extracting it: the archive is
+    # memory-mapped, then only the footer, the index and the requested entry are touched.
+    # Handles the legacy index (V9 and older) and the path hash / full directory index of
+    # V10+, with uncompressed and zlib entries.
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            with tracer.span('read_pak_index', file=str(path)):
+                self.read_footer()
+                self.entries = {}
+                self.read_index()
+        except (struct.error, IndexError, UnicodeDecodeError):
+            self.close()
+            raise ValueError(f"{path} is not a valid pak file!") from None
+        except ValueError:
+            self.close()
+            raise
+
+    def close(self):
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read_footer(self):
+        # The footer's size depends on the version stored inside it, so try every layout
+        for size, slots in PAK_FOOTER_LAYOUTS:
+            start = len(self.data) - size
+            if start < 0:
+                continue
+            magic_at = start + (16 if size >= 61 else 0) + (1 if size >= 45 else 0)
+            magic, version, index_offset, index_size = struct.unpack_from('<IIQQ', self.data, magic_at)
+            if magic != PAK_MAGIC or pak_footer_size(version, slots) != size:
+                continue
+            if size >= 45 and self.data[magic_at - 1]:
+                raise ValueError(f"{self.path} has an encrypted index!")
+            self.version = version
+            self.v8a = version == 8 and slots == 4
+            names_at = magic_at + 44 + (1 if version == 9 else 0)
+            self.compression = [bytes(self.data[names_at + 32 * i:names_at + 32 * (i + 1)]).rstrip(b'\0').decode('ascii')
+                                for i in range(slots if version >= 8 else 0)]
+            self.index_offset = index_offset
+            self.index_size = index_size
+            return
+        raise ValueError(f"{self.path} is not a pak file!")
+
+    def string(self, pos):
+        length, = struct.unpack_from('<i', self.data, pos)
+        pos += 4
+        if length < 0:
+            end = pos - 2 * length
+            return bytes(self.data[pos:end - 2]).decode('utf-16-le'), end
+        return bytes(self.data[pos:pos + length - 1]).decode('utf-8'), pos + length
+
+    def compression_method(self, compression):
+        # Up to V7 the entry stores the method itself, from V8 a 1-based slot into the footer names
+        if not compression:
+            return None
+        if self.version < 8:
+            return {1: 'Zlib'}.get(compression, str(compression))
+        if compression > len(self.compression):
+            return str(compression)
+        return self.compression[compression - 1]
+
+    def read_entry(self, pos):
+        # One serialized FPakEntry, as stored in the legacy index and in front of every entry's data
+        offset, compressed, uncompressed = struct.unpack_from('<QQQ', self.data, pos)
+        pos += 24
+        if self.v8a:
+            compression = self.data[pos]
+            pos += 1
+        else:
+            compression, = struct.unpack_from('<I', self.data, pos)
+            pos += 4
+        if self.version == 1:
+            pos += 8
+        pos += 20
+        blocks = None
+        encrypted = False
+        if self.version >= 3:
+            if compression:
+                count, = struct.unpack_from('<I', self.data, pos)
+                blocks = [struct.unpack_from('<QQ', self.data, pos + 4 + 16 * i) for i in range(count)]
+                pos += 4 + 16 * count
+            encrypted = bool(self.data[pos])
+            pos += 5
+        return {'offset': offset, 'size': compressed, 'uncompressed': uncompressed,
+                'compression': self.compression_method(compression), 'blocks': blocks,
+                'encrypted': encrypted}, pos
+
+    def entry_header_size(self, compressed, blocks):
+        size = 24 + (1 if self.v8a else 4) + (8 if self.version == 1 else 0) + 20
+        if compressed:
+            size += 4 + 16 * blocks
+        return size + (5 if self.version >= 3 else 0)
+
+    def read_encoded_entry(self, pos):
+        # V10+ bit-packed entry: flags word, then 32 or 64 bit offset and sizes, then block sizes
+        bits, = struct.unpack_from('<I', self.data, pos)
+        pos += 4
+        compression = (bits >> 23) & 0x3f
+        encrypted = bool(bits & (1 << 22))
+        block_count = (bits >> 6) & 0xffff
+        if bits & 0x3f == 0x3f:
+            pos += 4
+
+        values = []
+        for bit in [31, 30, 29][:3 if compression else 2]:
+            if bits & (1 << bit):
+                values.append(struct.unpack_from('<I', self.data, pos)[0])
+                pos += 4
+            else:
+                values.append(struct.unpack_from('<Q', self.data, pos)[0])
+                pos += 8
+        offset, uncompressed = values[:2]
+        compressed = values[2] if compression else uncompressed
+
+        blocks = None
+        if block_count:
+            start = self.entry_header_size(compression, block_count)
+            if block_count == 1 and not encrypted:
+                blocks = [(start, start + compressed)]
+            else:
+                blocks = []
+                for _ in range(block_count):
+                    size, = struct.unpack_from('<I', self.data, pos)
+                    pos += 4
+                    blocks.append((start, start + size))
+                    start += (size + 15) // 16 * 16 if encrypted else size
+        return {'offset': offset, 'size': compressed, 'uncompressed': uncompressed,
+                'compression': self.compression_method(compression), 'blocks': blocks,
+                'encrypted': encrypted}
+
+    def read_index(self):
+        pos = self.index_offset
+        self.mount_point, pos = self.string(pos)
+        count, = struct.unpack_from('<I', self.data, pos)
+        pos += 4
+        if self.version < 10:
+            for _ in range(count):
+                name, pos = self.string(pos)
+                self.entries[name], pos = self.read_entry(pos)
+            return
+
+        pos += 8  # path hash seed
+        has_path_hash_index, = struct.unpack_from('<I', self.data, pos)
+        pos += 4 + (36 if has_path_hash_index else 0)
+        has_directory_index, = struct.unpack_from('<I', self.data, pos)
+        pos += 4
+        if not has_directory_index:
+            raise ValueError(f"{self.path} has no full directory index!")
+        directory_offset, _ = struct.unpack_from('<QQ', self.data, pos)
+        pos += 36
+        encoded_size, = struct.unpack_from('<I', self.data, pos)
+        encoded_start = pos + 4
+        pos = encoded_start + encoded_size
+        # Entries that don't fit the encoded form are stored in full after the encoded ones
+        unencoded_count, = struct.unpack_from('<I', self.data, pos)
+        pos += 4
+        unencoded = []
+        for _ in range(unencoded_count):
+            entry, pos = self.read_entry(pos)
+            unencoded.append(entry)
+
+        pos = directory_offset
+        directories, = struct.unpack_from('<I', self.data, pos)
+        pos += 4
+        for _ in range(directories):
+            directory, pos = self.string(pos)
+            files, = struct.unpack_from('<I', self.data, pos)
+            pos += 4
+            for _ in range(files):
+                name, pos = self.string(pos)
+                location, = struct.unpack_from('<i', self.data, pos)
+                pos += 4
+                if location >= 0:
+                    entry = self.read_encoded_entry(encoded_start + location)
+                else:
+                    entry = unencoded[-location - 1]
+                self.entries[(directory + name).lstrip('/')] = entry
+
+    def read(self, name):
+        entry = self.entries[name]
+        if entry['encrypted']:
+            raise ValueError(f"{name} is encrypted!")
+        offset = entry['offset']
+        with tracer.span('read_pak_entry', entry=name):
+            try:
+                if entry['compression'] is None:
+                    # The data follows the entry's own copy of its record
+                    _, start = self.read_entry(offset)
+                    data = bytes(self.data[start:start + entry['size']])
+                elif entry['compression'].lower() == 'zlib':
+                    base = offset if self.version >= 5 else 0
+                    data = b''.join(zlib.decompress(self.data[base + start:base + end])
+                                    for start, end in entry['blocks'])
+                else:
+                    raise ValueError(f"{name} uses unsupported {entry['compression']} compression!")
+            except (struct.error, IndexError, zlib.error):
+                raise ValueError(f"{name} in {self.path} is corrupt!") from None
+            if len(data) != entry['uncompressed']:
+                raise ValueError(f"{name} in {self.path} is truncated!")
+            tracer.add_bytes(len(data))
+        return data
+
+
+def read_mod_config(pak_path, schema=None):
+    # The section/key values a SCAM pak applies, ready for the editor's update_entries
+    schema = schema or load_schema()
+    with PakReader(pak_path) as pak:
+        names = [name for name in pak.entries if name.endswith(MOD_CFG_PATH)]
+        names = names or [name for name in pak.entries if name.endswith('.cfg')]
+        if not names:
+            raise ValueError(f"No cfg found in {pak_path}!")
+        text = pak.read(names[0]).decode('utf-8-sig', 'replace')
+
+    config = {}
+    for body in parse_struct_body(text).values():
+        for section, values in body.items():
+            if not isinstance(values, dict):
+                continue
+            for key, value in values.items():
+                if (section, key) in schema.index and not isinstance(value, dict):
+                    config.setdefault(section, {})[key] = schema.parse(section, key, value)
+    return config
+
+
+def iter_override_paths(struct, prefix):
+    for key, value in struct.items():
+        if isinstance(value, dict):
+            yield from iter_override_paths(value, f'{prefix}/{key}')
+        else:
+            yield f'{prefix}/{key}'
+
+
+def scan_pak(path):
+    # What one pak changes: the files it ships and the prototype/section/key paths its cfgs set.
+    # A struct with a refkey patches the prototype it names, so its keys count against that one.
+    record = {'files': [], 'keys': [], 'error': ''}
+    keys = set()
+    try:
+        with PakReader(path) as pak:
+            record['files'] = sorted(pak.entries)
+            for name in record['files']:
+                if not name.endswith('.cfg'):
+                    continue
+                data = pak.read(name)
+                _, references = PrototypeIndex.scan(data)
+                for prototype, body in parse_struct_body(data.decode('utf-8-sig', 'replace')).items():
+                    if isinstance(body, dict):
+                        refkey = references.get(prototype, [None, None])[1]
+                        keys.update(iter_override_paths(body, refkey or prototype))
+    except (OSError, ValueError) as e:
+        record['error'] = str(e)
+    record['keys'] = sorted(keys)
+    return record
+
+
+def scan_mods(directory, cache_file=SCAN_CACHE, extra=(), jobs=None):
+    # Scans every .pak under directory (plus any extra paks), reusing cached results for
+    # archives whose size and mtime are unchanged and reading the rest on a thread pool
+    cache = read_json(cache_file)
+
+    paths = [os.path.abspath(p) for p in extra]
+    for root, _, files in os.walk(directory):
+        paths.extend(os.path.abspath(os.path.join(root, name)) for name in files if name.lower().endswith('.pak'))
+
+    records = {}
+    pending = {}
+    with tracer.span('scan_mods', paks=len(paths)):
+        for path in dict.fromkeys(paths):
+            stat = os.stat(path)
+            cached = cache.get(path)
+            if cached and cached['mtime'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+                records[path] = cached
+            else:
+                pending[path] = (stat.st_mtime_ns, stat.st_size)
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                for path, record in zip(pending, executor.map(scan_pak, pending)):
+                    record['mtime'], record['size'] = pending[path]
+                    records[path] = record
+            cache = {path: record for path, record in {**cache, **records}.items() if os.path.exists(path)}
+            write_json_atomic(cache_file, cache)
+    return records
+
+
+def pak_load_order(path):
+    # Paks mount in name order and later ones win, hence the z_ prefix on mods meant to override
+    return os.path.basename(path).lower()
+
+
+def find_conflicts(records, target):
+    # (key, paks setting it in load order, winning pak) for every key of target another pak sets too
+    owners = {}
+    for path in sorted(records, key=pak_load_order):
+        for key in records[path]['keys'] + records[path]['files']:
+            owners.setdefault(key, []).append(path)
+    conflicts = []
+    for key in records[target]['keys'] + records[target]['files']:
+        if len(owners[key]) > 1:
+            conflicts.append((key, owners[key], owners[key][-1]))
+    return conflicts
+
+
+class BuildCancelled(Exception):
+    pass
+
+
+def cancellable(chunks, cancel):
+    for chunk in chunks:
+        if cancel.is_set():
+            raise BuildCancelled()
+        yield chunk
+
+
+def pack_with_repak(cfg_chunks, output=None, staging_dir='.', cancel=None):
+    # Stage SCAM.cfg under staging_dir/z_SCAMMovementAiming_P and pack it with repak.
+    # Each caller passes its own staging_dir so concurrent builds never share a tree.
+    if not os.path.exists(REPAK_PATH):
+        raise FileNotFoundError("repak.exe not found in repak folder!")
+
+    mod_dir = Path(staging_dir) / MOD_NAME
+    cfg_dir = mod_dir / MOD_CFG_DIR
+    cfg_dir.mkdir(parents=True, exist_ok=True)
+    command = [os.path.abspath(REPAK_PATH), 'pack', str(mod_dir)]
+    if output:
+        command.append(str(output))
+    try:
+        with tracer.span('write_cfg'), open(cfg_dir / 'SCAM.cfg', 'wb') as f:
+            write_cfg(f, cfg_chunks)
+            tracer.add_bytes(f.tell())
+
+        with tracer.span('repak'):
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            while True:
+                try:
+                    stdout, stderr = process.communicate(timeout=0.1)
+                    break
+                except subprocess.TimeoutExpired:
+                    if cancel and cancel.is_set():
+                        process.kill()
+                        process.communicate()
+                        raise BuildCancelled()
+            if process.returncode:
+                raise subprocess.CalledProcessError(process.returncode, command, stdout, stderr)
+    finally:
+        # Remove the directory after packing
+        with tracer.span('rmtree'):
+            shutil.rmtree(mod_dir)
+
+
+def pack_prototypes(prototypes, output=None, packer='python', staging_dir='.', cancel=None):
+    output = output or f'{MOD_NAME}.pak'
+    cfg_chunks = iter_cfg_chunks(prototypes)
+    if cancel:
+        cfg_chunks = cancellable(cfg_chunks, cancel)
+    if packer == 'repak':
+        pack_with_repak(cfg_chunks, output, staging_dir, cancel)
+    else:
+        write_pak(output, {MOD_CFG_PATH: cfg_chunks})
+
+
+def pack_mod(config, output=None, packer='python', staging_dir='.', cancel=None):
+    pack_prototypes([player_prototype(config)], output, packer, staging_dir, cancel)
+
+
+class BuildCache:
+    # Content-addressed store of built paks, keyed by the override dict and packer version.
+    # File mtimes double as the LRU clock: every hit touches the cached pak.
+    def __init__(self, directory=BUILD_CACHE_DIR, max_bytes=BUILD_CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def key(self, config, packer='python'):
+        canonical = json.dumps({'config': config, 'packer': packer, 'version': PACKER_VERSION},
+                               sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        return self.directory / f'{key}.pak'
+
+    def fetch(self, key, output):
+        cached = self.path(key)
+        try:
+            os.utime(cached)
+        except FileNotFoundError:
+            return False
+        if os.path.lexists(output):
+            os.remove(output)
+        try:
+            os.link(cached, output)
+        except OSError:
+            shutil.copyfile(cached, output)
+        return True
+
+    def store(self, key, pak_file):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.directory / f'{key}.{os.getpid()}.tmp'
+        shutil.copyfile(pak_file, tmp)
+        os.replace(tmp, self.path(key))
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.pak'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+def build_mod(config, output=None, packer='python', staging_dir='.', cache=None, cancel=None, progress=None):
+    # Packs config into output, reusing a cached pak when the same overrides were built before.
+    # Returns True on a cache hit. A cancelled or failed pack leaves no partial output behind.
+    output = output or f'{MOD_NAME}.pak'
+    progress = progress or (lambda message: None)
+    with tracer.span('build_mod', packer=packer):
+        key = cache.key(config, packer) if cache else None
+        if key:
+            progress("Checking build cache")
+            with tracer.span('cache_fetch'):
+                if cache.fetch(key, output):
+                    return True
+        # The output may be a hard link into the cache, never write through it
+        if os.path.lexists(output):
+            os.remove(output)
+        progress("Packing with repak" if packer == 'repak' else "Packing")
+        try:
+            with tracer.span('pack', packer=packer):
+                pack_mod(config, output, packer, staging_dir, cancel)
+        except BaseException:
+            if os.path.lexists(output):
+                os.remove(output)
+            raise
+        if key:
+            progress("Storing in build cache")
+            with tracer.span('cache_store'):
+                cache.store(key, output)
+        return False
+
+
+class BuildWorker:
+    # Runs mod builds one after another on a background thread. Progress and results are posted
+    # to `events` for the Tk thread to pick up, so the window never waits on a build.
+    def __init__(self):
+        self.jobs = queue.Queue()
+        self.events = queue.Queue()
+        self.current = None
+        self.thread = None
+        self.closing = threading.Event()
+        self.next_id = 1
+
+    def submit(self, config, output=None, packer='python', cache=None):
+        job = {'id': self.next_id, 'config': config, 'output': output, 'packer': packer,
+               'cache': cache, 'cancel': threading.Event()}
+        self.next_id += 1
+        self.jobs.put(job)
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run)
+            self.thread.start()
+        return job
+
+    def cancel(self):
+        job = self.current
+        if job:
+            job['cancel'].set()
+
+    def stop(self):
+        # Drops queued builds, cancels the running one and waits for it to clean up, so no
+        # half-written pak is left behind when the window closes
+        self.closing.set()
+        while True:
+            try:
+                self.jobs.get_nowait()
+            except queue.Empty:
+                break
+        self.cancel()
+        if self.thread is not None:
+            self.jobs.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            self.current = job
+            if self.closing.is_set():
+                job['cancel'].set()
+            self.events.put(('started', job, ''))
+            staging_dir = tempfile.mkdtemp(prefix='scam_') if job['packer'] == 'repak' else '.'
+            try:
+                with tracer.span('create_mod'):
+                    cached = build_mod(job['config'], job['output'], job['packer'], staging_dir, job['cache'],
+                                       job['cancel'], lambda message: self.events.put(('progress', job, message)))
+                self.events.put(('finished', job, 'cached' if cached else 'ok'))
+            except BuildCancelled:
+                self.events.put(('finished', job, 'cancelled'))
+            except Exception as e:
+                self.events.put(('failed', job, str(e)))
+            finally:
+                if staging_dir != '.':
+                    shutil.rmtree(staging_dir, ignore_errors=True)
+                self.current = None
+
+
+class PresetWatcher:
+    # Polls the preset folders (default_values.ini included) for added, changed and removed
+    # INIs. poll() only reports once a change has been quiet for `debounce` seconds, so an
+    # editor saving in several writes triggers a single rebuild.
+    def __init__(self, directories=(PRESET_DIR, BUILTIN_PRESET_DIR), debounce=WATCH_DEBOUNCE):
+        self.directories = directories
+        self.debounce = debounce
+        self.stamps = self.snapshot()
+        self.pending = {}
+        self.changed_at = None
+
+    def snapshot(self):
+        stamps = {}
+        for directory in self.directories:
+            if os.path.isdir(directory):
+                for entry in os.scandir(directory):
+                    if entry.name.endswith('.ini') and entry.is_file():
+                        stat = entry.stat()
+                        stamps[os.path.abspath(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    def poll(self):
+        stamps = self.snapshot()
+        changed = {path for path in stamps.keys() | self.stamps.keys() if stamps.get(path) != self.stamps.get(path)}
+        self.stamps = stamps
+        now = time.monotonic()
+        if changed:
+            self.pending.update(dict.fromkeys(changed))
+            self.changed_at = now
+        if self.pending and now - self.changed_at >= self.debounce:
+            changed, self.pending = set(self.pending), {}
+            return changed
+        return set()
+
+
+class WatchBuild:
+    # Rebuilds one preset into deploy_dir as its layers change. Only the changed layers are
+    # re-read, and the pak is only re-packed when the emitted SCAM.cfg differs from the
+    # deployed one; the new pak is then swapped in with a single rename.
+    def __init__(self, preset, deploy_dir, packer='python'):
+        self.preset = preset
+        self.deploy_dir = deploy_dir
+        self.packer = packer
+        self.output = os.path.join(deploy_dir, f'{MOD_NAME}.pak')
+        self.digest = None
+        self.reload()
+
+    def reload(self):
+        self.schema = load_effective_schema()
+        self.default_config, _ = self.schema.defaults()
+        self.resolver = PresetResolver(schema=self.schema)
+
+    def changed(self, paths):
+        if os.path.abspath(DEFAULT_INI) in paths:
+            self.reload()
+        else:
+            self.resolver.invalidate(Path(path).stem for path in paths)
+
+    def build(self):
+        # Returns 'deployed', 'unchanged' or 'empty'
+        with tracer.span('watch_build', preset=self.preset):
+            preset = self.resolver.resolve(self.preset)
+            invalid = self.schema.invalid_fields(preset)
+            if invalid:
+                raise ValueError("Invalid values for " + ", ".join(f'{section}.{key}' for section, key in invalid))
+            config = compute_overrides(self.default_config, preset, self.schema)
+            if not config:
+                # Back to the game's defaults: take the deployed pak out of the mods folder
+                # with a rename first, so the game never mounts a half-deleted archive
+                if os.path.exists(self.output):
+                    tmp = os.path.join(self.deploy_dir, f'.{MOD_NAME}.{os.getpid()}.tmp')
+                    os.replace(self.output, tmp)
+                    os.remove(tmp)
+                self.digest = None
+                return 'empty'
+            sha1 = hashlib.sha1()
+            for chunk in iter_cfg_chunks([player_prototype(config)]):
+                sha1.update(chunk)
+            digest = sha1.hexdigest()
+            if digest == self.digest and os.path.exists(self.output):
+                return 'unchanged'
+
+            os.makedirs(self.deploy_dir, exist_ok=True)
+            tmp = os.path.join(self.deploy_dir, f'.{MOD_NAME}.{os.getpid()}.tmp')
+            staging_dir = tempfile.mkdtemp(prefix='scam_') if self.packer == 'repak' else None
+            try:
+                pack_mod(config, tmp, self.packer, staging_dir)
+                os.replace(tmp, self.output)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                if staging_dir:
+                    shutil.rmtree(staging_dir, ignore_errors=True)
+            self.digest = digest
+            return 'deployed'
+
+
+def watch_preset(preset, deploy_dir, packer='python', interval=WATCH_INTERVAL, debounce=WATCH_DEBOUNCE):
+    watcher = PresetWatcher(debounce=debounce)
+    build = WatchBuild(preset, deploy_dir, packer)
+    # An empty change set builds once on start
+    changed = set()
+    print(f"Watching {PRESET_DIR} and {BUILTIN_PRESET_DIR} for '{preset}', deploying to {deploy_dir} (Ctrl+C to stop)")
+    try:
+        while True:
+            if changed is not None:
+                start = time.perf_counter()
+                try:
+                    if changed:
+                        build.changed(changed)
+                    status = build.build()
+                # An INI caught mid-save may not parse yet, report it and keep watching
+                except (OSError, ValueError, configparser.Error, subprocess.SubprocessError) as e:
+                    status = f'failed: {e}'
+                print(f"[{time.strftime('%H:%M:%S')}] {status} in {(time.perf_counter() - start) * 1000:.1f} ms")
+            time.sleep(interval)
+            changed = watcher.poll() or None
+    except KeyboardInterrupt:
+        return 0
+
+
+def bench_packers(config, runs=20, output_dir=None):
+    # Times the in-process writer against the repak.exe subprocess on the same config
+    output_dir = output_dir or tempfile.mkdtemp(prefix='scam_bench_')
+    results = {}
+    outputs = {}
+    for packer in ['python', 'repak']:
+        if packer == 'repak' and not os.path.exists(REPAK_PATH):
+            continue
+        output = os.path.join(output_dir, f'{packer}.pak')
+        timings = []
+        try:
+            for _ in range(runs):
+                start = time.perf_counter()
+                pack_mod(config, output, packer, output_dir)
+                timings.append(time.perf_counter() - start)
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"{packer}: skipped ({e})")
+            continue
+        timings.sort()
+        results[packer] = {'min': timings[0], 'median': timings[len(timings) // 2], 'runs': runs}
+        with open(output, 'rb') as f:
+            outputs[packer] = f.read()
+    shutil.rmtree(output_dir, ignore_errors=True)
+    if len(outputs) == 2:
+        results['identical'] = outputs['python'] == outputs['repak']
+    return results
+
+
+def write_synthetic_schema(directory, keys, section_size=BENCH_SECTION_SIZE):
+    # Writes a default_values.ini with `keys` fields and a preset overriding every tenth one
+    defaults_file = os.path.join(directory, f'defaults_{keys}.ini')
+    preset_file = os.path.join(directory, f'preset_{keys}.ini')
+    with open(defaults_file, 'w') as defaults, open(preset_file, 'w') as preset:
+        for index in range(keys):
+            if index % section_size == 0:
+                defaults.write(f"\n[Section{index // section_size}]\n")
+                preset.write(f"\n[Section{index // section_size}]\n")
+            if index % 3 == 0:
+                default, value = index, index + 1
+            elif index % 3 == 1:
+                default, value = f'{index / 7:.4f}', f'{index / 5:.4f}'
+            else:
+                default, value = 'false', 'true'
+            defaults.write(f"Key{index}={default} ; Description of key {index}\n")
+            if index % 10 == 0:
+                preset.write(f"Key{index} = {value}\n")
+    return defaults_file, preset_file
+
+
+def time_stage(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {'min': timings[0], 'median': timings[len(timings) // 2], 'runs': repeat}
+
+
+def run_benchmarks(sizes=BENCH_SIZES, repeat=5):
+    # Times each pipeline stage on synthetic schemas: parse -> diff -> emit -> pack
+    directory = tempfile.mkdtemp(prefix='scam_bench_')
+    results = []
+    try:
+        for keys in sizes:
+            defaults_file, preset_file = write_synthetic_schema(directory, keys)
+            cache_file = os.path.join(directory, f'schema_{keys}.json')
+            output = os.path.join(directory, f'bench_{keys}.pak')
+
+            def load_cached_schema():
+                _schemas.pop(os.path.abspath(defaults_file), None)
+                return load_schema(defaults_file, cache_file)
+
+            schema = load_cached_schema()
+            default_config, _ = schema.defaults()
+            preset = load_ini_file(preset_file, schema)
+            overrides = compute_overrides(default_config, preset, schema)
+
+            def diff_model():
+                model = ConfigModel(schema)
+                for (section, key), value in model.changes(preset).items():
+                    model.set(section, key, value)
+                return model.overrides()
+
+            stages = [
+                ('parse_defaults', lambda: compile_schema(defaults_file)),
+                ('load_schema_cached', load_cached_schema),
+                ('parse_preset', lambda: load_ini_file(preset_file, schema)),
+                ('diff', lambda: compute_overrides(default_config, preset, schema)),
+                ('diff_model', diff_model),
+                ('emit', lambda: sum(len(c) for c in iter_cfg_chunks([player_prototype(overrides)]))),
+                ('pack', lambda: pack_mod(overrides, output)),
+            ]
+            for stage, function in stages:
+                result = time_stage(function, repeat)
+                result.update({'stage': stage, 'keys': keys})
+                results.append(result)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {'python': sys.version.split()[0], 'platform': sys.platform, 'results': results}
+
+
+def compare_benchmarks(report, baseline, threshold):
+    # Returns the stages whose median got slower than threshold x the baseline median
+    previous = {(r['stage'], r['keys']): r['median'] for r in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        before = previous.get((result['stage'], result['keys']))
+        if before and result['median'] > before * threshold:
+            regressions.append((result['stage'], result['keys'], before, result['median']))
+    return regressions
+
+
+def build_preset(preset_file, output_dir, packer='python', cache_dir=BUILD_CACHE_DIR):
+    # Worker for batch builds: runs in its own process with its own staging directory
+    name = Path(preset_file).stem
+    result = {'preset': name, 'output': None, 'status': 'ok', 'keys': 0, 'error': '', 'seconds': 0.0}
+    start = time.perf_counter()
+    staging_dir = tempfile.mkdtemp(prefix='scam_') if packer == 'repak' else None
+    # Spans recorded here are handed back to the parent process with the result
+    tracer.spans = []
+    try:
+        with tracer.span('build_preset', preset=name):
+            schema = load_effective_schema()
+            default_config, _ = schema.defaults()
+            resolver = PresetResolver(search_dirs=(os.path.dirname(preset_file), PRESET_DIR, BUILTIN_PRESET_DIR),
+                                      schema=schema)
+            preset = resolver.resolve_config(name, load_ini_file(preset_file, schema))
+            invalid = schema.invalid_fields(preset)
+            if invalid:
+                raise ValueError("Invalid values for " + ", ".join(f'{section}.{key}' for section, key in invalid))
+            config = compute_overrides(default_config, preset, schema)
+            result['keys'] = sum(len(values) for values in config.values())
+            if not config:
+                result['status'] = 'skipped'
+                result['error'] = 'no changes from defaults'
+            else:
+                output = Path(output_dir) / name / f'{MOD_NAME}.pak'
+                output.parent.mkdir(parents=True, exist_ok=True)
+                cache = BuildCache(cache_dir) if cache_dir else None
+                if build_mod(config, output, packer, staging_dir, cache):
+                    result['status'] = 'cached'
+                result['output'] = str(output)
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = str(e)
+    finally:
+        if staging_dir:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+    result['seconds'] = time.perf_counter() - start
+    if tracer.enabled:
+        result['trace'] = tracer.spans
+    return result
+
+
+def build_presets(preset_files, output_dir='build', jobs=None, packer='python',
+                  cache_dir=BUILD_CACHE_DIR):
+    output_dir = os.path.abspath(output_dir)
+    cache_dir = os.path.abspath(cache_dir) if cache_dir else None
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(build_preset, os.path.abspath(f), output_dir, packer, cache_dir)
+                   for f in preset_files]
+        for future in as_completed(futures):
+            result = future.result()
+            tracer.spans.extend(result.pop('trace', []))
+            results.append(result)
+    results.sort(key=lambda r: r['preset'])
+    return results
+
+
+def print_build_summary(results, elapsed):
+    width = max([len(r['preset']) for r in results] + [6])
+    print(f"{'Preset':<{width}}  {'Status':<8}  {'Keys':>5}  {'Time':>8}  Output")
+    for r in results:
+        detail = r['output'] if r['output'] else r['error']
+        print(f"{r['preset']:<{width}}  {r['status']:<8}  {r['keys']:>5}  {r['seconds']:>7.3f}s  {detail}")
+    built = sum(1 for r in results if r['status'] in ['ok', 'cached'])
+    cached = sum(1 for r in results if r['status'] == 'cached')
+    print(f"Built {built}/{len(results)} presets ({cached} from cache) in {elapsed:.3f}s")
+
+
+def is_valid_preset_name(name):
+    return bool(name.strip()) and not INVALID_PRESET_NAME.search(name)
+
+
+class PresetStore:
+    # Persistent index of the presets in custom_ini: name, tags, touched keys, content hash and
+    # mtime. refresh() only re-reads files whose mtime or size changed, and parsed presets are
+    # kept in a small LRU cache.
+    def __init__(self, directory=PRESET_DIR, schema=None, cache_size=PRESET_CACHE_SIZE):
+        self.directory = directory
+        self.index_file = os.path.join(directory, PRESET_INDEX)
+        self.schema = schema
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.entries = read_json(self.index_file)
+        self.sorted_names = []
+        self.key_index = None
+        self.sort_names()
+
+    def path(self, name):
+        return os.path.join(self.directory, f'{name}.ini')
+
+    def sort_names(self):
+        self.sorted_names = sorted((name.lower(), name) for name in self.entries)
+        self.key_index = None
+
+    def index_preset(self, name, stat, previous=None):
+        # A preset that can't be read or parsed is still listed, with its error and nothing to search
+        entry = {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'sha1': '', 'tags': [], 'keys': []}
+        self.cache.pop(name, None)
+        try:
+            with open(self.path(name), 'rb') as f:
+                entry['sha1'] = hashlib.sha1(f.read()).hexdigest()
+            if previous and previous['sha1'] == entry['sha1']:
+                entry.update({key: previous[key] for key in ['tags', 'keys', 'error'] if key in previous})
+                return entry
+            config = self.load(name, entry['sha1'])
+        except (configparser.Error, OSError, UnicodeDecodeError) as e:
+            entry['error'] = str(e)
+            return entry
+
+        meta = config.get(PRESET_META_SECTION, {})
+        entry['tags'] = [tag.strip() for tag in str(meta.get('Tags', '')).split(',') if tag.strip()]
+        entry['keys'] = [f'{section}.{key}' for section, values in config.items()
+                         if section != PRESET_META_SECTION for key in values]
+        return entry
+
+    def refresh(self):
+        found = {}
+        if os.path.isdir(self.directory):
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith('.ini') and entry.is_file():
+                    found[entry.name[:-len('.ini')]] = entry.stat()
+
+        changed = set(self.entries) - set(found)
+        for name in changed:
+            del self.entries[name]
+            self.cache.pop(name, None)
+        for name, stat in found.items():
+            previous = self.entries.get(name)
+            if previous and previous['mtime'] == stat.st_mtime_ns and previous['size'] == stat.st_size:
+                continue
+            self.entries[name] = self.index_preset(name, stat, previous)
+            changed.add(name)
+
+        if changed:
+            self.sort_names()
+            write_json_atomic(self.index_file, self.entries)
+        return changed
+
+    def names(self):
+        return [name for _, name in self.sorted_names]
+
+    def search(self, text, limit=None):
+        # "key:Section.Key" matches presets touching that key, "tag:name" matches tags,
+        # anything else is a case-insensitive name prefix
+        text = text.strip()
+        if text.startswith('key:'):
+            if self.key_index is None:
+                self.key_index = {}
+                for name, entry in self.entries.items():
+                    for key in entry['keys']:
+                        self.key_index.setdefault(key.lower(), set()).add(name)
+                        self.key_index.setdefault(key.split('.', 1)[-1].lower(), set()).add(name)
+            matches = sorted(self.key_index.get(text[len('key:'):].strip().lower(), ()), key=str.lower)
+        elif text.startswith('tag:'):
+            tag = text[len('tag:'):].strip().lower()
+            matches = [name for _, name in self.sorted_names
+                       if tag in (t.lower() for t in self.entries[name]['tags'])]
+        else:
+            prefix = text.lower()
+            start = bisect.bisect_left(self.sorted_names, (prefix,))
+            matches = []
+            for lowered, name in self.sorted_names[start:]:
+                if not lowered.startswith(prefix) or (limit and len(matches) >= limit):
+                    break
+                matches.append(name)
+        return matches[:limit] if limit else matches
+
+    def metadata(self, name):
+        if name not in self.entries or self.entries[name].get('error'):
+            return {}
+        return self.load(name).get(PRESET_META_SECTION, {})
+
+    def load(self, name, digest=None):
+        digest = digest or self.entries.get(name, {}).get('sha1')
+        cached = self.cache.get(name)
+        if cached and cached[0] == digest:
+            self.cache.move_to_end(name)
+            return cached[1]
+        config = load_ini_file(self.path(name), self.schema)
+        self.cache[name] = (digest, config)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return config
+
+
+def preset_parents(config):
+    parents = config.get(PRESET_META_SECTION, {}).get('Parents', '')
+    return [name.strip() for name in str(parents).split(',') if name.strip()]
+
+
+def merge_config(merged, config):
+    for section, values in config.items():
+        if section != PRESET_META_SECTION:
+            merged.setdefault(section, {}).update(values)
+    return merged
+
+
+def layer_overrides(config, base, default_config):
+    # What a preset layered on top of base has to store for it to resolve to config
+    layer = {}
+    for section, values in default_config.items():
+        for key, default_value in values.items():
+            value = config.get(section, {}).get(key, default_value)
+            if str(value) != str(base.get(section, {}).get(key, default_value)):
+                layer.setdefault(section, {})[key] = value
+    return layer
+
+
+class PresetResolver:
+    # Resolves presets that list parent layers (Parents = a, b in their [Preset] section) into
+    # one effective config: parents in order, then the preset's own values. Every merge is
+    # memoized, and invalidate() drops a changed preset together with everything layered on it,
+    # so a resolved preset is a dictionary lookup until one of its layers changes.
+    def __init__(self, store=None, search_dirs=(PRESET_DIR, BUILTIN_PRESET_DIR), schema=None):
+        self.store = store
+        self.search_dirs = search_dirs
+        self.schema = schema or (store.schema if store else None)
+        self.resolved = {}
+        self.children = {}
+
+    def load_layer(self, name):
+        if self.store and name in self.store.entries:
+            return self.store.load(name)
+        for directory in self.search_dirs:
+            path = os.path.join(directory, f'{name}.ini')
+            if os.path.exists(path):
+                return load_ini_file(path, self.schema)
+        raise ValueError(f"Preset '{name}' not found!")
+
+    def resolve(self, name, stack=()):
+        if name not in self.resolved:
+            self.resolved[name] = self.resolve_config(name, self.load_layer(name), stack)
+        return self.resolved[name]
+
+    def resolve_config(self, name, config, stack=()):
+        if name in stack:
+            raise ValueError(f"Preset '{name}' is layered on itself!")
+        merged = self.resolve_parents(name, preset_parents(config), stack + (name,))
+        return merge_config(merged, config)
+
+    def resolve_parents(self, name, parents, stack=()):
+        merged = {}
+        for parent in parents:
+            self.children.setdefault(parent, set()).add(name)
+            merge_config(merged, self.resolve(parent, stack))
+        return merged
+
+    def invalidate(self, names):
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            self.resolved.pop(name, None)
+            pending.extend(self.children.pop(name, ()))
+
+
+def field_range(section, key):
+    return FIELD_RANGES.get((section, key), DEFAULT_RANGE)
+
+
+def sweep_range(section, key):
+    return SWEEP_RANGES.get((section, key)) or FIELD_RANGES.get((section, key), SWEEP_DEFAULT_RANGE)
+
+
+def parse_sweep_param(text, schema):
+    # "MovementParams.BaseTurnRate=30:80:10" (start:stop:step, stop included) or "...=0.1,0.2,0.5"
+    name, _, spec = text.partition('=')
+    section, _, key = name.strip().partition('.')
+    field = schema.index.get((section, key))
+    if field is None or field.type not in [int, float]:
+        raise ValueError(f"{name.strip()} is not a numeric setting")
+    try:
+        if ':' in spec:
+            start, stop, step = [float(part) for part in spec.split(':')]
+            if step <= 0:
+                raise ValueError
+            count = int((stop - start) / step + 1e-9) + 1
+            values = [start + i * step for i in range(count)]
+        else:
+            values = [float(part) for part in spec.split(',')]
+    except ValueError:
+        raise ValueError(f"Invalid sweep values for {name.strip()}: {spec}") from None
+    if not values:
+        raise ValueError(f"No sweep values for {name.strip()}")
+    return (section, key), values
+
+
+def require_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("Parameter sweeps need NumPy (pip install numpy)") from None
+    return numpy
+
+
+def sweep_grid(values):
+    # Every combination of the swept values, one config per row and one field per column
+    np = require_numpy()
+    axes = np.meshgrid(*[np.asarray(v, dtype=np.float64) for v in values], indexing='ij')
+    return np.stack([axis.ravel() for axis in axes], axis=1)
+
+
+def validate_sweep(fields, grid, base_config):
+    # Mask of the grid rows passing the type, range and cross-field checks, computed column-wise.
+    # Fields that are not swept take their value from base_config.
+    np = require_numpy()
+    columns = {field: grid[:, i] for i, field in enumerate(fields)}
+    mask = np.isfinite(grid).all(axis=1)
+    for field, column in columns.items():
+        if field in INTEGER_FIELDS:
+            mask &= column == np.floor(column)
+        low, high = sweep_range(*field)
+        mask &= (column >= low) & (column <= high)
+
+    for low_field, high_field in CROSS_FIELD_RULES:
+        if low_field not in columns and high_field not in columns:
+            continue
+        low, high = [columns[field] if field in columns else float(base_config[field[0]][field[1]])
+                     for field in [low_field, high_field]]
+        mask &= low <= high
+    return mask
+
+
+def format_sweep_value(value):
+    # %g drops the float noise that stepping adds (0.30000000000000004 -> 0.3)
+    return '%.10g' % value
+
+
+def write_sweep_presets(fields, rows, output_dir, prefix='sweep', base=None):
+    os.makedirs(output_dir, exist_ok=True)
+    sections = {}
+    for i, field in enumerate(fields):
+        sections.setdefault(field[0], []).append((field[1], i))
+    width = len(str(max(len(rows) - 1, 0)))
+    files = []
+    with tracer.span('write_sweep', presets=len(rows)):
+        for n, row in enumerate(rows.tolist()):
+            lines = [f'[{PRESET_META_SECTION}]', 'Tags = sweep']
+            if base:
+                lines.append(f'Parents = {base}')
+            for section, keys in sections.items():
+                lines.append(f'\n[{section}]')
+                lines.extend(f'{key} = {format_sweep_value(row[i])}' for key, i in keys)
+            filename = os.path.join(output_dir, f'{prefix}_{n:0{width}d}.ini')
+            with open(filename, 'w') as f:
+                f.write('\n'.join(lines) + '\n\n')
+            files.append(filename)
+    return files
+
+
+def run_sweep(params, base=None, output_dir='sweep', prefix='sweep'):
+    # Returns (candidates, written preset files, seconds spent validating)
+    schema = load_effective_schema()
+    default_config, _ = schema.defaults()
+    parsed = [parse_sweep_param(param, schema) for param in params]
+    fields = [field for field, _ in parsed]
+    base_config = default_config
+    if base:
+        resolver = PresetResolver(schema=schema)
+        base_config = merge_config({section: dict(values) for section, values in default_config.items()},
+                                   resolver.resolve(base))
+
+    with tracer.span('sweep', fields=len(fields)):
+        grid = sweep_grid([values for _, values in parsed])
+        start = time.perf_counter()
+        with tracer.span('validate_sweep', rows=len(grid)):
+            mask = validate_sweep(fields, grid, base_config)
+        seconds = time.perf_counter() - start
+        files = write_sweep_presets(fields, grid[mask], output_dir, prefix, base)
+    return len(grid), files, seconds
+
 
 class MovementConfigEditor:
     def __init__(self):
@@ -12,43 +1929,18 @@ class MovementConfigEditor:
         self.window.title("SCAM - Stalker Configurator Aiming & Movement")
         self.window.geometry("1000x800")
 
-        self.load_default_config()
-        self.v3fish_config = self.load_ini_file('default_ini/v3fish_recommended.ini')
-        self.xy_fix_config = self.load_ini_file('default_ini/xysensitivityfix.ini')
-        self.sync_sensitivity = tk.BooleanVar(value=False)
-        self.setup_gui()
+        with tracer.span('startup'):
+            with tracer.span('load_default_config'):
+                self.load_default_config()
+            self.v3fish_config = self.load_ini_file('default_ini/v3fish_recommended.ini')
+            self.xy_fix_config = self.load_ini_file('default_ini/xysensitivityfix.ini')
+            self.sync_sensitivity = tk.BooleanVar(value=False)
+            with tracer.span('setup_gui'):
+                self.setup_gui()
 
     def load_default_config(self):
-        config = configparser.ConfigParser()
-        config.optionxform = str
-        config.read('default_ini/default_values.ini')
-        
-        self.default_config = {}
-        self.descriptions = {}
-        
-        for section in config.sections():
-            self.default_config[section] = {}
-            self.descriptions[section] = {}
-            for key, value in config.items(section):
-                if key.startswith(';'):
-                    continue
-                    
-                parts = value.split(';', 1)
-                raw_value = parts[0].strip()
-                description = parts[1].strip() if len(parts) > 1 else ''
-                
-                try:
-                    if raw_value.lower() in ['true', 'false']:
-                        self.default_config[section][key] = raw_value.lower() == 'true'
-                    elif '.' in raw_value:
-                        self.default_config[section][key] = float(raw_value)
-                    else:
-                        self.default_config[section][key] = int(raw_value)
-                except ValueError:
-                    self.default_config[section][key] = raw_value
-                    
-                if description:
-                    self.descriptions[section][key] = description
+        self.schema = load_effective_schema()
+        self.default_config, self.descriptions = self.schema.defaults()
 
     def setup_gui(self):
         top_frame = ttk.Frame(self.window)
@@ -62,10 +1954,14 @@ class MovementConfigEditor:
         self.preset_var = tk.StringVar()
         self.preset_combo = ttk.Combobox(preset_frame, textvariable=self.preset_var)
         self.preset_combo.pack(side='left', padx=5)
+        self.preset_combo.bind('<KeyRelease>', self.filter_presets)
         
         ttk.Button(preset_frame, text="Load Preset", command=self.load_custom_preset).pack(side='left', padx=5)
-        ttk.Button(preset_frame, text="Save Preset", command=self.save_preset).pack(side='left', padx=5)
-        ttk.Button(preset_frame, text="Create Mod", command=self.create_mod).pack(side='right', padx=5)
+        self.save_button = ttk.Button(preset_frame, text="Save Preset", command=self.save_preset)
+        self.save_button.pack(side='left', padx=5)
+        ttk.Button(preset_frame, text="Import Pak", command=self.import_pak).pack(side='left', padx=5)
+        self.create_button = ttk.Button(preset_frame, text="Create Mod", command=self.create_mod)
+        self.create_button.pack(side='right', padx=5)
 
         # Recommended presets frame
         recommended_frame = ttk.Frame(top_frame)
@@ -79,209 +1975,221 @@ class MovementConfigEditor:
         ttk.Button(buttons_frame, text="XY Sensitivity Aim Fix", command=self.load_xy_fix).pack(side='left', padx=5)
 
 
-        if os.path.exists('custom_ini'):
+        self.presets = PresetStore(PRESET_DIR, self.schema)
+        self.resolver = PresetResolver(self.presets)
+        if os.path.exists(PRESET_DIR):
             self.load_presets()
 
+        # Background build status
+        status_frame = ttk.Frame(self.window)
+        status_frame.pack(side='bottom', fill='x', padx=5, pady=5)
+        self.build_status = tk.StringVar()
+        self.cancel_button = ttk.Button(status_frame, text="Cancel", command=self.cancel_build, state='disabled')
+        self.cancel_button.pack(side='right', padx=5)
+        self.build_progress = ttk.Progressbar(status_frame, mode='indeterminate', length=150)
+        self.build_progress.pack(side='right', padx=5)
+        ttk.Label(status_frame, textvariable=self.build_status).pack(side='left', padx=5)
+        self.builds = BuildWorker()
+        self.builds_pending = 0
+
         container = ttk.Frame(self.window)
         container.pack(fill='both', expand=True, padx=5, pady=5)
         
-        canvas = tk.Canvas(container)
-        scrollbar = ttk.Scrollbar(container, orient="vertical", command=canvas.yview)
+        self.canvas = tk.Canvas(container)
+        self.scrollbar = ttk.Scrollbar(container, orient="vertical", command=self.canvas.yview)
         
-        main_frame = ttk.Frame(canvas)
-        main_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+        main_frame = ttk.Frame(self.canvas)
+        main_frame.bind("<Configure>", self.schedule_scrollregion)
+        self.scrollregion_pending = False
+        self.rows_pending = False
 
-        canvas.create_window((0, 0), window=main_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        self.canvas.create_window((0, 0), window=main_frame, anchor="nw")
+        self.canvas.configure(yscrollcommand=self.on_canvas_scroll)
 
-        scrollbar.pack(side="right", fill="y")
-        canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
 
-        notebook = ttk.Notebook(main_frame)
-        notebook.pack(fill='both', expand=True)
+        self.notebook = ttk.Notebook(main_frame)
+        self.notebook.pack(fill='both', expand=True)
 
+        # Current value of every field, widgets only exist for rows that have been shown
+        self.model = ConfigModel(self.schema)
         self.entries = {}
         self.checkboxes = {}
+        self.tabs = {}
         
         # Create regular sections first
         for section in self.default_config:
             if section not in ['MovementParams', 'Aiming']:
-                frame = ttk.Frame(notebook)
-                notebook.add(frame, text=section)
-                self.setup_section_frame(frame, section)
+                self.add_tab(section, [(section, key) for key in self.default_config[section]])
 
         # Create MovementParams section
         if 'MovementParams' in self.default_config:
-            frame = ttk.Frame(notebook)
-            notebook.add(frame, text='MovementParams')
-            self.setup_movement_frame(frame)
+            self.add_tab('MovementParams', [('MovementParams', key) for key in self.default_config['MovementParams']
+                                            if key not in AIMING_KEYS])
         
-        # Create Aiming section last
-        aiming_frame = ttk.Frame(notebook)
-        notebook.add(aiming_frame, text="Aiming")
-        
-        # Add sync checkbox
+        # Add sync checkbox state
         if 'Aiming' in self.default_config and 'SyncTurnRate' in self.default_config['Aiming']:
             self.sync_sensitivity.set(self.default_config['Aiming']['SyncTurnRate'])
-            
-        sync_check = ttk.Checkbutton(aiming_frame, text="Sync Turn/Look Rate", 
-                                    variable=self.sync_sensitivity,
-                                    command=self.sync_sensitivity_rates)
-        sync_check.grid(row=0, column=1, padx=5, pady=2, sticky='w')
+
+        # Create Aiming section last
+        self.add_tab('Aiming', [('MovementParams', key) for key in AIMING_KEYS], aiming=True)
+
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        self.on_tab_changed()
+        self.update_buttons()
+
+    def add_tab(self, title, rows, aiming=False):
+        # Tabs start empty and are filled the first time they are selected
+        frame = ttk.Frame(self.notebook)
+        self.notebook.add(frame, text=title)
+        self.tabs[str(frame)] = {'frame': frame, 'rows': rows, 'built': 0, 'aiming': aiming}
+
+    def current_tab(self):
+        return self.tabs.get(self.notebook.select())
+
+    def on_tab_changed(self, event=None):
+        tab = self.current_tab()
+        if tab and tab['built'] == 0:
+            self.build_rows(tab)
+
+    def build_rows(self, tab):
+        self.rows_pending = False
+        frame = tab['frame']
+        if tab['aiming'] and tab['built'] == 0:
+            sync_check = ttk.Checkbutton(frame, text="Sync Turn/Look Rate", 
+                                        variable=self.sync_sensitivity,
+                                        command=self.sync_sensitivity_rates)
+            sync_check.grid(row=0, column=1, padx=5, pady=2, sticky='w')
+
+        start = tab['built']
+        end = min(start + ROW_CHUNK, len(tab['rows']))
+        for index in range(start, end):
+            section, key = tab['rows'][index]
+            row = index + 1 if tab['aiming'] else index
+            self.add_row(frame, row, section, key, tab['aiming'])
+        tab['built'] = end
+
+    def add_row(self, frame, row, section, key, aiming=False):
+        value = self.default_config[section][key]
+        ttk.Label(frame, text=key).grid(row=row, column=0, padx=5, pady=2, sticky='e')
         
-        # Add aiming controls
-        for row, key in enumerate(['BaseTurnRate', 'BaseLookUpRate'], 1):
-            ttk.Label(aiming_frame, text=key).grid(row=row, column=0, padx=5, pady=2, sticky='e')
-            
-            entry = ttk.Entry(aiming_frame)
-            entry.insert(0, str(self.default_config['MovementParams'][key]))
+        if isinstance(value, bool):
+            var = tk.BooleanVar(value=self.model.get(section, key))
+            checkbox = ttk.Checkbutton(frame, variable=var,
+                                       command=lambda s=section, k=key: self.toggle_checkbox(s, k))
+            checkbox.grid(row=row, column=1, padx=5, pady=2, sticky='w')
+            self.checkboxes[(section, key)] = var
+        else:
+            entry = ttk.Entry(frame)
+            entry.insert(0, self.model.get(section, key))
+            entry.configure(foreground=self.entry_color(section, key))
             entry.grid(row=row, column=1, padx=5, pady=2, sticky='w')
-            entry.bind('<KeyRelease>', lambda e, k=key: self.validate_aiming_entry(k))
-            self.entries[('MovementParams', key)] = entry
-            
-            # Default value and description
-            default_value = str(self.default_config['MovementParams'][key])
-            ttk.Label(aiming_frame, text=f"Default: {default_value}", font=('Arial', 8)).grid(
+            if aiming:
+                entry.bind('<KeyRelease>', lambda e, k=key: self.validate_aiming_entry(k))
+            else:
+                entry.bind('<KeyRelease>', lambda e, s=section, k=key: self.validate_entry(s, k))
+            self.entries[(section, key)] = entry
+        
+        # Default value and description
+        if not isinstance(value, bool):
+            ttk.Label(frame, text=f"Default: {value}", font=('Arial', 8)).grid(
                 row=row, column=2, padx=5, pady=2, sticky='w')
-            ttk.Label(aiming_frame, text=self.descriptions['MovementParams'][key], font=('Arial', 8)).grid(
+        
+        if section in self.descriptions and key in self.descriptions[section]:
+            ttk.Label(frame, text=self.descriptions[section][key], font=('Arial', 8)).grid(
                 row=row, column=3, padx=5, pady=2, sticky='w')
 
-    def setup_section_frame(self, frame, section):
-        row = 0
-        for key, value in self.default_config[section].items():
-            ttk.Label(frame, text=key).grid(row=row, column=0, padx=5, pady=2, sticky='e')
-            
-            if isinstance(value, bool):
-                var = tk.BooleanVar(value=value)
-                checkbox = ttk.Checkbutton(frame, variable=var)
-                checkbox.grid(row=row, column=1, padx=5, pady=2, sticky='w')
-                self.checkboxes[(section, key)] = var
-            else:
-                entry = ttk.Entry(frame)
-                entry.insert(0, str(value))
-                entry.grid(row=row, column=1, padx=5, pady=2, sticky='w')
-                entry.bind('<KeyRelease>', lambda e, s=section, k=key: self.validate_entry(s, k))
-                self.entries[(section, key)] = entry
-            
-            # Default value and description
-            if not isinstance(value, bool):
-                ttk.Label(frame, text=f"Default: {value}", font=('Arial', 8)).grid(
-                    row=row, column=2, padx=5, pady=2, sticky='w')
-            
-            if section in self.descriptions and key in self.descriptions[section]:
-                ttk.Label(frame, text=self.descriptions[section][key], font=('Arial', 8)).grid(
-                    row=row, column=3, padx=5, pady=2, sticky='w')
-            row += 1
-
-    def setup_movement_frame(self, frame):
-        row = 0
-        for key, value in self.default_config['MovementParams'].items():
-            if key not in ['BaseTurnRate', 'BaseLookUpRate']:
-                ttk.Label(frame, text=key).grid(row=row, column=0, padx=5, pady=2, sticky='e')
-                
-                if isinstance(value, bool):
-                    var = tk.BooleanVar(value=value)
-                    checkbox = ttk.Checkbutton(frame, variable=var)
-                    checkbox.grid(row=row, column=1, padx=5, pady=2, sticky='w')
-                    self.checkboxes[('MovementParams', key)] = var
-                else:
-                    entry = ttk.Entry(frame)
-                    entry.insert(0, str(value))
-                    entry.grid(row=row, column=1, padx=5, pady=2, sticky='w')
-                    entry.bind('<KeyRelease>', lambda e, k=key: self.validate_entry('MovementParams', k))
-                    self.entries[('MovementParams', key)] = entry
-                
-                # Default value and description
-                if not isinstance(value, bool):
-                    ttk.Label(frame, text=f"Default: {value}", font=('Arial', 8)).grid(
-                        row=row, column=2, padx=5, pady=2, sticky='w')
-                
-                if 'MovementParams' in self.descriptions and key in self.descriptions['MovementParams']:
-                    ttk.Label(frame, text=self.descriptions['MovementParams'][key], font=('Arial', 8)).grid(
-                        row=row, column=3, padx=5, pady=2, sticky='w')
-                row += 1
+    def on_canvas_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        # Build more rows of the current tab once the end of what exists comes into view
+        tab = self.current_tab()
+        if tab and float(last) >= 0.9 and 0 < tab['built'] < len(tab['rows']) and not self.rows_pending:
+            self.rows_pending = True
+            self.window.after_idle(self.build_rows, tab)
+
+    def schedule_scrollregion(self, event=None):
+        # Recompute the scrollregion once per idle period instead of on every <Configure>
+        if not self.scrollregion_pending:
+            self.scrollregion_pending = True
+            self.window.after_idle(self.update_scrollregion)
+
+    def update_scrollregion(self):
+        self.scrollregion_pending = False
+        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+
+    def entry_color(self, section, key):
+        if not self.model.is_valid(section, key):
+            return 'red'
+        return 'green' if self.model.is_modified(section, key) else 'black'
+
+    def set_value(self, section, key, value, recolor=True):
+        self.model.set(section, key, value)
+        if (section, key) in self.entries:
+            entry = self.entries[(section, key)]
+            entry.delete(0, tk.END)
+            entry.insert(0, value)
+            if recolor:
+                entry.configure(foreground=self.entry_color(section, key))
+        elif (section, key) in self.checkboxes:
+            self.checkboxes[(section, key)].set(value)
+
+    def toggle_checkbox(self, section, key):
+        self.model.set(section, key, self.checkboxes[(section, key)].get())
+        self.update_buttons()
 
     def sync_sensitivity_rates(self):
         if self.sync_sensitivity.get():
-            turn_value = self.entries[('MovementParams', 'BaseTurnRate')].get()
-            try:
-                value = int(turn_value)
-                self.entries[('MovementParams', 'BaseLookUpRate')].delete(0, tk.END)
-                self.entries[('MovementParams', 'BaseLookUpRate')].insert(0, str(value))
-                self.validate_entry('MovementParams', 'BaseLookUpRate')
-            except ValueError:
-                pass
+            validator = self.schema.validators[('MovementParams', 'BaseTurnRate')]
+            value = validator.parse(self.model.get('MovementParams', 'BaseTurnRate'))
+            if value is not None:
+                self.set_value('MovementParams', 'BaseLookUpRate', validator.format(value))
+        self.update_buttons()
 
     def validate_aiming_entry(self, key):
         entry = self.entries[('MovementParams', key)]
         current_value = entry.get()
-        try:
-            value = int(current_value)
-            if self.sync_sensitivity.get():
-                # Update both entries
-                for rate_key in ['BaseTurnRate', 'BaseLookUpRate']:
-                    entry = self.entries[('MovementParams', rate_key)]
-                    default_value = str(self.default_config['MovementParams'][rate_key])
-                    entry.delete(0, tk.END)
-                    entry.insert(0, str(value))
-                    entry.configure(foreground='green' if str(value) != default_value else 'black')
-            else:
-                # Update only the current entry
-                default_value = str(self.default_config['MovementParams'][key])
-                entry.configure(foreground='green' if current_value != default_value else 'black')
-        except ValueError:
-            entry.configure(foreground='red')
+        self.model.set('MovementParams', key, current_value)
+        validator = self.schema.validators[('MovementParams', key)]
+        value = validator.parse(current_value)
+        if value is not None and self.sync_sensitivity.get():
+            # Update both entries
+            for rate_key in AIMING_KEYS:
+                self.set_value('MovementParams', rate_key, validator.format(value))
+        entry.configure(foreground=self.entry_color('MovementParams', key))
+        self.update_buttons()
 
     def validate_entry(self, section, key):
         entry = self.entries[(section, key)]
-        default_value = str(self.default_config[section][key])
-        current_value = entry.get()
-
-        try:
-            if not current_value:
-                entry.configure(foreground='red')
-                return False
-
-            if '.' in current_value:
-                float(current_value)
-            else:
-                int(current_value)
-
-            entry.configure(foreground='green' if str(current_value) != default_value else 'black')
-            return True
-        except ValueError:
-            entry.configure(foreground='red')
-            return False
+        self.model.set(section, key, entry.get())
+        entry.configure(foreground=self.entry_color(section, key))
+        self.update_buttons()
+        return self.model.is_valid(section, key)
 
     def has_invalid_entries(self):
-        return any(entry.cget('foreground') == 'red' or not entry.get() 
-                  for entry in self.entries.values())
+        return self.model.has_invalid()
 
     def has_changes(self):
-        # Check normal entries
-        for (section, key), entry in self.entries.items():
-            current_value = entry.get()
-            default_value = str(self.default_config[section][key])
-            if current_value != default_value:
-                return True
-                
-        # Check checkboxes and sync sensitivity
-        for (section, key), checkbox in self.checkboxes.items():
-            current_value = checkbox.get()
-            default_value = self.default_config[section][key]
-            if current_value != default_value:
-                return True
-                
+        if self.model.has_changes():
+            return True
         if 'Aiming' in self.default_config and 'SyncTurnRate' in self.default_config['Aiming']:
             if self.sync_sensitivity.get() != self.default_config['Aiming']['SyncTurnRate']:
                 return True
         return False
 
+    def update_buttons(self):
+        state = 'disabled' if self.has_invalid_entries() or not self.has_changes() else 'normal'
+        self.save_button.configure(state=state)
+        self.create_button.configure(state=state)
+
     def load_presets(self):
-        if not os.path.exists('custom_ini'):
-            return
-        presets = [f.replace('.ini', '') for f in os.listdir('custom_ini') if f.endswith('.ini')]
-        self.preset_combo['values'] = presets
+        self.resolver.invalidate(self.presets.refresh())
+        self.preset_combo['values'] = self.presets.names()
+
+    def filter_presets(self, event=None):
+        # Narrow the dropdown to name prefix, "key:" or "tag:" matches as the user types
+        text = self.preset_var.get()
+        self.preset_combo['values'] = self.presets.search(text) if text else self.presets.names()
 
     def load_default(self):
         self.sync_sensitivity.set(False)
@@ -297,35 +2205,48 @@ class MovementConfigEditor:
         selected = self.preset_var.get()
         if not selected:
             return
-        config = self.load_ini_file(f'custom_ini/{selected}.ini')
+        self.resolver.invalidate(self.presets.refresh())
+        if selected not in self.presets.entries:
+            messagebox.showerror("Error", f"Preset '{selected}' not found!")
+            return
+        if self.presets.entries[selected].get('error'):
+            messagebox.showerror("Error", f"Preset '{selected}' can't be read: {self.presets.entries[selected]['error']}")
+            return
+        try:
+            config = self.resolver.resolve(selected)
+        except (ValueError, configparser.Error, OSError, UnicodeDecodeError) as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.update_entries(config)
+
+    def import_pak(self):
+        filename = filedialog.askopenfilename(title="Import Pak", filetypes=[("Pak files", "*.pak"), ("All files", "*.*")])
+        if not filename:
+            return
+        try:
+            config = read_mod_config(filename, self.schema)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", str(e))
+            return
+        # A pak only holds the changed values, everything else goes back to its default
         self.update_entries(config)
+        messagebox.showinfo("Success", f"Imported {sum(len(values) for values in config.values())} settings "
+                                       f"from {os.path.basename(filename)}")
 
     def update_entries(self, config):
-        # Reset all entries to default values
-        for (section, key), entry in self.entries.items():
-            default_value = str(self.default_config[section][key])
-            entry.delete(0, tk.END)
-            entry.insert(0, default_value)
-            entry.configure(foreground='black')
-            
-        for (section, key), checkbox in self.checkboxes.items():
-            default_value = self.default_config[section][key]
-            checkbox.set(default_value)
-
-        # Update with new values
-        for section in config:
-            for key, value in config[section].items():
-                if section == 'Aiming' and key == 'SyncTurnRate':
-                    self.sync_sensitivity.set(value)
-                elif isinstance(value, bool):
-                    if (section, key) in self.checkboxes:
-                        self.checkboxes[(section, key)].set(value)
-                else:
-                    if (section, key) in self.entries:
-                        entry = self.entries[(section, key)]
-                        entry.delete(0, tk.END)
-                        entry.insert(0, str(value))
-                        self.validate_entry(section, key)
+        # Only touch the fields whose value actually changes
+        changes = self.model.changes(config)
+        for (section, key), value in changes.items():
+            self.set_value(section, key, value, recolor=False)
+
+        # Recolor the touched entries in one pass once every value is in place
+        for field in changes:
+            if field in self.entries:
+                self.entries[field].configure(foreground=self.entry_color(*field))
+
+        if 'Aiming' in config and 'SyncTurnRate' in config['Aiming']:
+            self.sync_sensitivity.set(config['Aiming']['SyncTurnRate'])
+        self.update_buttons()
 
     def save_preset(self):
         if self.has_invalid_entries():
@@ -336,8 +2257,9 @@ class MovementConfigEditor:
             messagebox.showwarning("Warning", "Make changes before saving a preset!")
             return
 
+        # The preset box doubles as the search box, so search text is never taken as a name
         selected = self.preset_var.get()
-        if selected:
+        if selected and is_valid_preset_name(selected):
             if not messagebox.askyesno("Confirm Overwrite", f"Do you want to overwrite the preset '{selected}'?"):
                 return
             name = selected
@@ -345,39 +2267,44 @@ class MovementConfigEditor:
             name = simpledialog.askstring("Save Preset", "Enter preset name:")
             if not name:
                 return
+            if not is_valid_preset_name(name):
+                messagebox.showerror("Error", f"'{name}' can't be used as a preset name!")
+                return
             
-        config = {}
-        for section in self.default_config:
-            if section != 'Aiming':
-                changed_values = {}
-                for key, value in self.default_config[section].items():
-                    if isinstance(value, bool):
-                        current_value = self.checkboxes[(section, key)].get()
-                        if current_value != value:
-                            changed_values[key] = current_value
-                    else:
-                        current_value = self.entries[(section, key)].get()
-                        default_value = str(value)
-                        if current_value != default_value:
-                            try:
-                                if '.' in current_value:
-                                    changed_values[key] = float(current_value)
-                                else:
-                                    changed_values[key] = int(current_value)
-                            except ValueError:
-                                messagebox.showerror("Error", f"Invalid value for {key}!")
-                                return
-                if changed_values:
-                    config[section] = changed_values
-
-        # Add Aiming section if sync is checked
-        if self.sync_sensitivity.get():
-            config['Aiming'] = {'SyncTurnRate': True}
+        try:
+            with tracer.span('collect_values'):
+                config = self.model.overrides()
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        # Keep the tags and parent layers of a preset being overwritten,
+        # storing only what differs from the resolved parents
+        metadata = self.presets.metadata(name)
+        try:
+            base = self.resolver.resolve_parents(name, preset_parents({PRESET_META_SECTION: metadata}))
+        except (ValueError, configparser.Error, OSError, UnicodeDecodeError) as e:
+            messagebox.showerror("Error", str(e))
+            return
+        if base:
+            config = layer_overrides(config, base, self.default_config)
 
-        if not os.path.exists('custom_ini'):
-            os.makedirs('custom_ini')
+        # Add Aiming section if sync differs from what is inherited
+        if self.sync_sensitivity.get() != base.get('Aiming', {}).get('SyncTurnRate', False):
+            config['Aiming'] = {'SyncTurnRate': self.sync_sensitivity.get()}
+
+        if metadata:
+            config = {PRESET_META_SECTION: metadata, **config}
+
+        if not os.path.exists(PRESET_DIR):
+            os.makedirs(PRESET_DIR)
             
-        self.save_ini_file(config, f'custom_ini/{name}.ini')
+        try:
+            with tracer.span('save_preset', preset=name):
+                self.save_ini_file(config, self.presets.path(name))
+        except OSError as e:
+            messagebox.showerror("Error", str(e))
+            return
         self.load_presets()
         messagebox.showinfo("Success", "Preset saved successfully!")
 
@@ -390,93 +2317,277 @@ class MovementConfigEditor:
             messagebox.showwarning("Warning", "Make changes before creating a mod!")
             return
 
-        config = {}
-        for section in self.default_config:
-            if section != 'Aiming':  # Skip Aiming section for mod creation
-                changed_values = {}
-                for key, value in self.default_config[section].items():
-                    if isinstance(value, bool):
-                        current_value = self.checkboxes[(section, key)].get()
-                        if current_value != value:
-                            changed_values[key] = current_value
-                    else:
-                        current_value = self.entries[(section, key)].get()
-                        default_value = str(value)
-                        if current_value != default_value:
-                            try:
-                                if '.' in current_value:
-                                    changed_values[key] = float(current_value)
-                                else:
-                                    changed_values[key] = int(current_value)
-                            except ValueError:
-                                messagebox.showerror("Error", f"Invalid value for {key}!")
-                                return
-                if changed_values:
-                    config[section] = changed_values
-
-        mod_path = Path('z_SCAMMovementAiming_P/Stalker2/Content/GameLite/GameData/ObjPrototypes')
-        mod_path.mkdir(parents=True, exist_ok=True)
-        
-        cfg_content = "CustomPlayer : struct.begin {refurl=../ObjPrototypes.cfg; refkey=Player}\n"
-        for section, values in config.items():
-            cfg_content += f"   {section} : struct.begin\n"
-            for key, value in values.items():
-                cfg_content += f"      {key} = {value}\n"
-            cfg_content += "   struct.end\n"
-        cfg_content += "struct.end"
-        
-        with open(mod_path / 'SCAM.cfg', 'w') as f:
-            f.write(cfg_content)
-        
-        if os.path.exists('repak/repak.exe'):
+        try:
+            with tracer.span('collect_values'):
+                config = self.model.overrides()
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        # The build runs on a worker thread, further clicks queue up behind it
+        self.builds.submit(config, cache=BuildCache())
+        self.builds_pending += 1
+        if self.builds_pending == 1:
+            self.build_progress.start()
+            self.cancel_button.configure(state='normal')
+            self.window.after(BUILD_POLL_MS, self.poll_builds)
+        self.show_build_status("Mod creation queued")
+
+    def show_build_status(self, message):
+        queued = self.builds_pending - 1
+        self.build_status.set(f"{message} ({queued} queued)" if queued > 0 else message)
+
+    def cancel_build(self):
+        self.builds.cancel()
+        self.show_build_status("Cancelling...")
+
+    def on_close(self):
+        if self.builds_pending:
+            if not messagebox.askyesno("Confirm Exit", "A mod is still being created. Cancel it and exit?"):
+                return
+            self.show_build_status("Cancelling...")
+        self.builds.stop()
+        self.window.destroy()
+
+    def poll_builds(self):
+        while True:
             try:
-                subprocess.run(['repak/repak.exe', 'pack', 'z_SCAMMovementAiming_P'])
-                # Remove the directory after successful packing
-                shutil.rmtree('z_SCAMMovementAiming_P')
-                messagebox.showinfo("Success", "Mod created successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to create mod: {str(e)}")
+                event, job, detail = self.builds.events.get_nowait()
+            except queue.Empty:
+                break
+            if event == 'started':
+                self.show_build_status("Creating mod...")
+            elif event == 'progress':
+                self.show_build_status(f"{detail}...")
+            else:
+                self.builds_pending -= 1
+                if event == 'failed':
+                    self.show_build_status("Mod creation failed")
+                    messagebox.showerror("Error", f"Failed to create mod: {detail}")
+                elif detail == 'cancelled':
+                    self.show_build_status("Mod creation cancelled")
+                else:
+                    self.show_build_status("Mod created successfully!")
+                    messagebox.showinfo("Success", "Mod created successfully!")
+
+        if self.builds_pending:
+            self.window.after(BUILD_POLL_MS, self.poll_builds)
         else:
-            messagebox.showerror("Error", "repak.exe not found in repak folder!")
+            self.build_progress.stop()
+            self.cancel_button.configure(state='disabled')
 
     def load_ini_file(self, filename):
-        config = configparser.ConfigParser()
-        config.optionxform = str
-        config.read(filename)
-        
-        result = {}
-        for section in config.sections():
-            result[section] = {}
-            for key, value in config.items(section):
-                if key.startswith(';'):
-                    continue
-                    
-                value = value.split(';')[0].strip()
-                    
-                try:
-                    if value.lower() in ['true', 'false']:
-                        result[section][key] = value.lower() == 'true'
-                    elif '.' in value:
-                        result[section][key] = float(value)
-                    else:
-                        result[section][key] = int(value)
-                except ValueError:
-                    result[section][key] = value
-        return result
+        return load_ini_file(filename, self.schema)
 
     def save_ini_file(self, config, filename):
         ini = configparser.ConfigParser()
         ini.optionxform = str
         for section, values in config.items():
             if values:
-                ini[section] = {k: str(v) for k, v in values.items()}
+                ini[section] = {k: format_value(v) for k, v in values.items()}
             
-        with open(filename, 'w') as f:
+        with tracer.span('write_ini', file=str(filename)), open(filename, 'w') as f:
             ini.write(f)
+            tracer.add_bytes(f.tell())
 
     def run(self):
-        self.window.mainloop()
+        self.window.protocol("WM_DELETE_WINDOW", self.on_close)
+        try:
+            self.window.mainloop()
+        finally:
+            self.builds.stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SCAM - Stalker Configurator Aiming & Movement")
+    parser.add_argument('--trace', metavar='FILE',
+                        help="Record timing spans and write them to FILE on exit (or set %s)" % TRACE_ENV)
+    parser.add_argument('--trace-format', choices=['json', 'chrome'],
+                        help="Trace file format (default: json)")
+    parser.add_argument('--game-data', metavar='DIR',
+                        help="Extracted game data to read true Player defaults from (or set %s)" % GAME_DATA_ENV)
+    subparsers = parser.add_subparsers(dest='command')
+
+    build_parser = subparsers.add_parser('build', help="Build mods from presets without the GUI")
+    build_parser.add_argument('presets', nargs='*',
+                              help="Preset INI files to build (default: custom_ini/*.ini)")
+    build_parser.add_argument('-o', '--output-dir', default='build',
+                              help="Directory receiving one <preset>/%s.pak per preset" % MOD_NAME)
+    build_parser.add_argument('-j', '--jobs', type=int, default=None,
+                              help="Number of worker processes (default: all cores)")
+    build_parser.add_argument('--packer', choices=['python', 'repak'], default='python',
+                              help="Pack in-process (default) or with repak/repak.exe")
+    build_parser.add_argument('--cache-dir', default=BUILD_CACHE_DIR,
+                              help="Build cache directory (default: %(default)s)")
+    build_parser.add_argument('--no-cache', action='store_true', help="Always re-pack every preset")
+
+    bench_parser = subparsers.add_parser('bench-pack', help="Compare the in-process packer with repak.exe")
+    bench_parser.add_argument('preset', help="Preset INI file to pack")
+    bench_parser.add_argument('-n', '--runs', type=int, default=20, help="Number of timed runs per packer")
+
+    suite_parser = subparsers.add_parser('bench', help="Benchmark parse, diff, emit and pack on synthetic schemas")
+    suite_parser.add_argument('--sizes', type=int, nargs='+', default=BENCH_SIZES,
+                              help="Schema sizes in keys (default: %(default)s)")
+    suite_parser.add_argument('-n', '--repeat', type=int, default=5, help="Timed runs per stage")
+    suite_parser.add_argument('-o', '--output', help="Write the results as JSON to this file")
+    suite_parser.add_argument('--baseline', help="Results JSON to compare against")
+    suite_parser.add_argument('--threshold', type=float, default=1.25,
+                              help="Fail when a median exceeds the baseline by this factor (default: %(default)s)")
+
+    sweep_parser = subparsers.add_parser('sweep', help="Write (and optionally build) every valid combination of settings")
+    sweep_parser.add_argument('params', nargs='+', metavar='SECTION.KEY=VALUES',
+                              help="Values to sweep: start:stop:step or a comma separated list")
+    sweep_parser.add_argument('--base', help="Preset the sweep is layered on (default: game defaults)")
+    sweep_parser.add_argument('-o', '--output-dir', default='sweep', help="Directory for the generated presets")
+    sweep_parser.add_argument('--prefix', default='sweep', help="File name prefix of the generated presets")
+    sweep_parser.add_argument('--build', action='store_true', help="Build every generated preset")
+    sweep_parser.add_argument('--build-dir', default='build', help="Output directory for --build")
+    sweep_parser.add_argument('-j', '--jobs', type=int, default=None, help="Worker processes for --build")
+
+    import_parser = subparsers.add_parser('import', help="Recover a preset from a built .pak")
+    import_parser.add_argument('pak', help="Pak file to read")
+    import_parser.add_argument('-o', '--output', help="Preset INI to write (default: print to stdout)")
+
+    scan_parser = subparsers.add_parser('scan', help="Report which of the mod's settings other paks also change")
+    scan_parser.add_argument('mods_dir', help="Mods folder to scan, e.g. Stalker2/Content/Paks/~mods")
+    scan_parser.add_argument('--pak', default=f'{MOD_NAME}.pak',
+                             help="Pak to check, inside or outside the folder (default: %(default)s)")
+    scan_parser.add_argument('-j', '--jobs', type=int, default=None, help="Reader threads")
+
+    watch_parser = subparsers.add_parser('watch', help="Rebuild and deploy a preset whenever its INIs change")
+    watch_parser.add_argument('preset', help="Preset name in custom_ini or default_ini")
+    watch_parser.add_argument('--deploy', required=True, metavar='DIR',
+                              help="Folder the pak is swapped into, e.g. Stalker2/Content/Paks/~mods")
+    watch_parser.add_argument('--packer', choices=['python', 'repak'], default='python',
+                              help="Pack in-process (default) or with repak/repak.exe")
+    watch_parser.add_argument('--debounce', type=float, default=WATCH_DEBOUNCE,
+                              help="Seconds a change must be quiet before rebuilding (default: %(default)s)")
+
+    prototype_parser = subparsers.add_parser('prototype', help="Print a resolved prototype from the game data")
+    prototype_parser.add_argument('name', nargs='?', default=GAME_PROTOTYPE, help="Prototype name (default: Player)")
+
+    args = parser.parse_args(argv)
+
+    # Exported through the environment so batch worker processes record spans too
+    if args.trace:
+        os.environ[TRACE_ENV] = os.path.abspath(args.trace)
+    if args.trace_format:
+        os.environ[TRACE_FORMAT_ENV] = args.trace_format
+    if args.game_data:
+        os.environ[GAME_DATA_ENV] = os.path.abspath(args.game_data)
+    tracer.enabled = bool(os.environ.get(TRACE_ENV))
+
+    try:
+        return run_command(args)
+    finally:
+        if tracer.enabled:
+            tracer.export(os.environ[TRACE_ENV], os.environ.get(TRACE_FORMAT_ENV, 'json'))
+
+
+def run_command(args):
+    if args.command == 'build':
+        presets = args.presets or sorted(glob.glob('custom_ini/*.ini'))
+        if not presets:
+            print("No presets to build")
+            return 1
+        start = time.perf_counter()
+        cache_dir = None if args.no_cache else args.cache_dir
+        results = build_presets(presets, args.output_dir, args.jobs, args.packer, cache_dir)
+        print_build_summary(results, time.perf_counter() - start)
+        return 1 if any(r['status'] == 'failed' for r in results) else 0
+
+    if args.command == 'bench-pack':
+        schema = load_effective_schema()
+        default_config, _ = schema.defaults()
+        config = compute_overrides(default_config, load_ini_file(args.preset, schema), schema)
+        results = bench_packers(config, args.runs)
+        for packer in ['python', 'repak']:
+            if packer in results:
+                r = results[packer]
+                print(f"{packer:<7} min {r['min'] * 1000:8.3f} ms  median {r['median'] * 1000:8.3f} ms")
+        if 'identical' in results:
+            print("Output identical" if results['identical'] else "Output differs!")
+            return 0 if results['identical'] else 1
+        return 0
+
+    if args.command == 'sweep':
+        try:
+            candidates, files, seconds = run_sweep(args.params, args.base, args.output_dir, args.prefix)
+        except (RuntimeError, ValueError, KeyError) as e:
+            print(e)
+            return 1
+        print(f"{len(files)}/{candidates} combinations valid (checked in {seconds * 1000:.3f} ms), "
+              f"written to {args.output_dir}")
+        if args.build and files:
+            start = time.perf_counter()
+            results = build_presets(files, args.build_dir, args.jobs)
+            print_build_summary(results, time.perf_counter() - start)
+            return 1 if any(r['status'] == 'failed' for r in results) else 0
+        return 0
+
+    if args.command == 'import':
+        try:
+            config = read_mod_config(args.pak)
+        except (OSError, ValueError) as e:
+            print(e)
+            return 1
+        ini = configparser.ConfigParser()
+        ini.optionxform = str
+        for section, values in config.items():
+            ini[section] = {key: format_value(value) for key, value in values.items()}
+        if args.output:
+            with open(args.output, 'w') as f:
+                ini.write(f)
+        else:
+            ini.write(sys.stdout)
+        return 0
+
+    if args.command == 'scan':
+        if not os.path.exists(args.pak):
+            print(f"{args.pak} not found, create the mod first or pass --pak")
+            return 1
+        start = time.perf_counter()
+        records = scan_mods(args.mods_dir, extra=[args.pak], jobs=args.jobs)
+        target = os.path.abspath(args.pak)
+        for path, record in sorted(records.items()):
+            if record['error']:
+                print(f"Skipped {path}: {record['error']}")
+        conflicts = find_conflicts(records, target)
+        for key, paks, winner in conflicts:
+            others = ", ".join(os.path.basename(p) for p in paks if p != target)
+            print(f"{key}: also set by {others}; {os.path.basename(winner)} wins")
+        print(f"{len(conflicts)} conflicts across {len(records)} paks in {time.perf_counter() - start:.3f}s")
+        return 0
+
+    if args.command == 'watch':
+        return watch_preset(args.preset, args.deploy, args.packer, debounce=args.debounce)
+
+    if args.command == 'prototype':
+        if not os.environ.get(GAME_DATA_ENV):
+            print(f"Pass --game-data or set {GAME_DATA_ENV}")
+            return 1
+        index = PrototypeIndex()
+        print(json.dumps(index.resolve(find_prototypes_cfg(os.environ[GAME_DATA_ENV]), args.name), indent=2))
+        return 0
+
+    if args.command == 'bench':
+        report = run_benchmarks(args.sizes, args.repeat)
+        print(f"{'Stage':<20}  {'Keys':>7}  {'Median':>12}  {'Min':>12}")
+        for r in report['results']:
+            print(f"{r['stage']:<20}  {r['keys']:>7}  {r['median'] * 1000:9.3f} ms  {r['min'] * 1000:9.3f} ms")
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2)
+        if args.baseline:
+            with open(args.baseline) as f:
+                regressions = compare_benchmarks(report, json.load(f), args.threshold)
+            for stage, keys, before, after in regressions:
+                print(f"REGRESSION {stage} @ {keys} keys: {before * 1000:.3f} ms -> {after * 1000:.3f} ms")
+            return 1 if regressions else 0
+        return 0
 
-if __name__ == "__main__":
     app = MovementConfigEditor()
-    app.run()
\ No newline at end of file
+    app.run()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
\ No newline at end of file
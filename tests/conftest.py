@@ -0,0 +1,21 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+
+
+@pytest.fixture(scope='session')
+def scam():
+    # The app is a single script with spaces in its name, so load it by path
+    spec = importlib.util.spec_from_file_location('scam', ROOT / 'SCAM - Stalker Configurator Aiming Movement.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='session')
+def schema(scam):
+    return scam.compile_schema(ROOT / scam.DEFAULT_INI)
@@ -0,0 +1,86 @@
+import os
+import threading
+
+import pytest
+
+CONFIG = {'MovementParams': {'WalkSpeed': 200}}
+OTHER = {'MovementParams': {'WalkSpeed': 300}}
+
+
+def test_hit_hard_links_cached_pak(scam, tmp_path):
+    cache = scam.BuildCache(tmp_path / 'cache')
+    output = tmp_path / 'out.pak'
+    assert scam.build_mod(CONFIG, output, cache=cache) is False
+    built = output.read_bytes()
+    output.unlink()
+
+    assert scam.build_mod(CONFIG, output, cache=cache) is True
+    assert output.read_bytes() == built
+    assert os.path.samefile(output, cache.path(cache.key(CONFIG)))
+
+
+def test_hit_copies_when_hard_links_fail(scam, tmp_path, monkeypatch):
+    cache = scam.BuildCache(tmp_path / 'cache')
+    output = tmp_path / 'out.pak'
+    scam.build_mod(CONFIG, output, cache=cache)
+    output.unlink()
+
+    def no_link(src, dst):
+        raise OSError("links not supported")
+    monkeypatch.setattr(os, 'link', no_link)
+    assert scam.build_mod(CONFIG, output, cache=cache) is True
+    assert not os.path.samefile(output, cache.path(cache.key(CONFIG)))
+    assert output.read_bytes() == cache.path(cache.key(CONFIG)).read_bytes()
+
+
+def test_key_depends_on_packer_and_config(scam, tmp_path):
+    cache = scam.BuildCache(tmp_path)
+    assert cache.key(CONFIG) == cache.key({'MovementParams': {'WalkSpeed': 200}})
+    assert cache.key(CONFIG) != cache.key(OTHER)
+    assert cache.key(CONFIG, 'python') != cache.key(CONFIG, 'repak')
+
+
+def test_evicts_least_recently_used_over_budget(scam, tmp_path):
+    cache = scam.BuildCache(tmp_path / 'cache', max_bytes=2500)
+    paks = []
+    for i in range(3):
+        pak = tmp_path / f'{i}.pak'
+        pak.write_bytes(bytes(1000))
+        paks.append(pak)
+    cache.store('a', paks[0])
+    cache.store('b', paks[1])
+    # 'a' is older than 'b', but a hit makes it the most recently used
+    os.utime(cache.path('a'), (1, 1))
+    os.utime(cache.path('b'), (2, 2))
+    assert cache.fetch('a', tmp_path / 'hit.pak')
+    cache.store('c', paks[2])
+
+    assert cache.path('a').exists()
+    assert not cache.path('b').exists()
+    assert cache.path('c').exists()
+    assert sum(p.stat().st_size for p in (tmp_path / 'cache').glob('*.pak')) <= 2500
+
+
+def test_rebuild_never_writes_through_cache_link(scam, tmp_path):
+    cache = scam.BuildCache(tmp_path / 'cache')
+    output = tmp_path / 'out.pak'
+    scam.build_mod(CONFIG, output, cache=cache)
+    output.unlink()
+    scam.build_mod(CONFIG, output, cache=cache)
+    cached = cache.path(cache.key(CONFIG))
+    before = cached.read_bytes()
+
+    # A different config packed to the same output must replace the link, not the cached pak
+    assert scam.build_mod(OTHER, output, cache=cache) is False
+    assert cached.read_bytes() == before
+    assert output.read_bytes() != before
+
+
+def test_cancelled_build_leaves_no_output(scam, tmp_path):
+    output = tmp_path / 'out.pak'
+    output.write_bytes(b'old')
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(scam.BuildCancelled):
+        scam.build_mod(CONFIG, output, cancel=cancel)
+    assert not output.exists()
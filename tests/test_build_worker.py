@@ -0,0 +1,45 @@
+import threading
+
+CONFIG = {'MovementParams': {'WalkSpeed': 200}}
+
+
+def drain(worker):
+    events = []
+    while not worker.events.empty():
+        event, job, detail = worker.events.get_nowait()
+        events.append((event, job['id'], detail))
+    return events
+
+
+def test_builds_run_in_order(scam, tmp_path):
+    worker = scam.BuildWorker()
+    worker.submit(CONFIG, tmp_path / 'a.pak')
+    worker.submit({'MovementParams': {'WalkSpeed': 300}}, tmp_path / 'b.pak')
+    worker.jobs.put(None)
+    worker.thread.join()
+    finished = [e for e in drain(worker) if e[0] == 'finished']
+    assert finished == [('finished', 1, 'ok'), ('finished', 2, 'ok')]
+    assert (tmp_path / 'a.pak').exists() and (tmp_path / 'b.pak').exists()
+
+
+def test_stop_cancels_running_build_and_drops_queue(scam, tmp_path, monkeypatch):
+    packing = threading.Event()
+
+    def slow_pack(config, output, packer='python', staging_dir='.', cancel=None):
+        with open(output, 'wb') as f:
+            f.write(b'partial')
+        packing.set()
+        cancel.wait(10)
+        raise scam.BuildCancelled()
+    monkeypatch.setattr(scam, 'pack_mod', slow_pack)
+
+    worker = scam.BuildWorker()
+    worker.submit(CONFIG, tmp_path / 'running.pak')
+    worker.submit(CONFIG, tmp_path / 'queued.pak')
+    assert packing.wait(10)
+    worker.stop()
+
+    assert worker.thread is None
+    assert drain(worker)[-1] == ('finished', 1, 'cancelled')
+    assert not (tmp_path / 'running.pak').exists()
+    assert not (tmp_path / 'queued.pak').exists()
@@ -0,0 +1,57 @@
+PROTOTYPES = [
+    ('CustomPlayer', {'refurl': '../ObjPrototypes.cfg', 'refkey': 'Player'},
+     {'MovementParams': {'WalkSpeed': 200, 'Limits': {'Air': {'Coef': 0.5}}}, 'Flag': True}),
+    ('CustomNPC', None, {'Speed': 1.0}),
+]
+
+
+def test_iter_cfg_lines_multiple_prototypes_and_deep_nesting(scam):
+    assert list(scam.iter_cfg_lines(PROTOTYPES)) == [
+        'CustomPlayer : struct.begin {refurl=../ObjPrototypes.cfg; refkey=Player}',
+        '   MovementParams : struct.begin',
+        '      WalkSpeed = 200',
+        '      Limits : struct.begin',
+        '         Air : struct.begin',
+        '            Coef = 0.5',
+        '         struct.end',
+        '      struct.end',
+        '   struct.end',
+        '   Flag = True',
+        'struct.end',
+        'CustomNPC : struct.begin',
+        '   Speed = 1.0',
+        'struct.end',
+    ]
+
+
+def test_iter_cfg_chunks_separates_lines_with_crlf(scam):
+    data = b''.join(scam.iter_cfg_chunks(PROTOTYPES))
+    assert data == '\r\n'.join(scam.iter_cfg_lines(PROTOTYPES)).encode('utf-8')
+    assert data.endswith(b'struct.end') and b'\n\n' not in data
+
+
+def test_pack_prototypes_round_trips_through_reader(scam, tmp_path):
+    output = tmp_path / 'multi.pak'
+    scam.pack_prototypes(PROTOTYPES, output)
+    with scam.PakReader(output) as pak:
+        text = pak.read(scam.MOD_CFG_PATH).decode('utf-8')
+    assert scam.parse_struct_body(text) == {
+        'CustomPlayer': {'MovementParams': {'WalkSpeed': '200', 'Limits': {'Air': {'Coef': '0.5'}}},
+                         'Flag': 'True'},
+        'CustomNPC': {'Speed': '1.0'},
+    }
+
+
+def test_write_pak_streams_several_entries(scam, tmp_path):
+    entries = {
+        'Mod/B.cfg': [b'second ', b'entry'],
+        'Mod/A.cfg': iter([b'first', b' entry', b'']),
+        'Mod/Sub/C.cfg': b'plain bytes',
+    }
+    output = tmp_path / 'several.pak'
+    scam.write_pak(output, entries)
+    with scam.PakReader(output) as pak:
+        assert sorted(pak.entries) == ['Mod/A.cfg', 'Mod/B.cfg', 'Mod/Sub/C.cfg']
+        assert pak.read('Mod/A.cfg') == b'first entry'
+        assert pak.read('Mod/B.cfg') == b'second entry'
+        assert pak.read('Mod/Sub/C.cfg') == b'plain bytes'
@@ -0,0 +1,62 @@
+from conftest import ROOT
+
+
+def v3fish(scam, schema):
+    return scam.load_ini_file(ROOT / scam.BUILTIN_PRESET_DIR / 'v3fish_recommended.ini', schema)
+
+
+def apply(model, config):
+    changes = model.changes(config)
+    for (section, key), value in changes.items():
+        model.set(section, key, value)
+    return changes
+
+
+def test_set_tracks_modified_and_invalid(scam, schema):
+    model = scam.ConfigModel(schema)
+    model.set('MovementParams', 'WalkSpeed', '200')
+    assert model.is_modified('MovementParams', 'WalkSpeed') and model.has_changes()
+    model.set('MovementParams', 'WalkSpeed', 'abc')
+    assert not model.is_valid('MovementParams', 'WalkSpeed') and model.has_invalid()
+    model.set('MovementParams', 'WalkSpeed', '160')
+    assert not model.has_changes() and not model.has_invalid()
+
+
+def test_overrides_match_compute_overrides(scam, schema):
+    default_config, _ = schema.defaults()
+    model = scam.ConfigModel(schema)
+    apply(model, v3fish(scam, schema))
+    model.set('VaultingParams', 'StartWithSprintPressed', True)
+    model.set('MovementParams', 'AirControlCoef', '1e-3')
+
+    values = {}
+    for (section, key), value in model.values.items():
+        values.setdefault(section, {})[key] = value
+    assert model.overrides() == scam.compute_overrides(default_config, values, schema)
+    assert model.overrides()['MovementParams']['AirControlCoef'] == 0.001
+    assert 'Aiming' not in model.overrides()
+
+
+def test_changes_from_defaults_are_only_the_differing_fields(scam, schema):
+    model = scam.ConfigModel(schema)
+    changes = model.changes({'MovementParams': {'WalkSpeed': 200, 'RunSpeed': 370},
+                             'VaultingParams': {'StartWithSprintPressed': True}})
+    # RunSpeed = 370 is the default already
+    assert changes == {('MovementParams', 'WalkSpeed'): '200',
+                       ('VaultingParams', 'StartWithSprintPressed'): True}
+
+
+def test_changes_reset_fields_the_new_config_leaves_out(scam, schema):
+    model = scam.ConfigModel(schema)
+    apply(model, {'MovementParams': {'WalkSpeed': 200, 'RunSpeed': 400}})
+    changes = model.changes({'MovementParams': {'RunSpeed': 400, 'SprintSpeed': 900}})
+    assert changes == {('MovementParams', 'WalkSpeed'): '160',
+                       ('MovementParams', 'SprintSpeed'): '900'}
+
+
+def test_reapplying_the_same_config_changes_nothing(scam, schema):
+    model = scam.ConfigModel(schema)
+    config = v3fish(scam, schema)
+    apply(model, config)
+    assert model.changes(config) == {}
+    assert apply(model, {}) and not model.has_changes()
@@ -0,0 +1,23 @@
+# repak_v8b.pak was written by repak (the repak 0.2.3 crate through its Python bindings,
+# https://pypi.org/project/repak/) with its pack defaults: version V8B, mount point ../../../,
+# no compression, holding tests/fixtures/SCAM.cfg at the path create_mod uses.
+from conftest import FIXTURES
+
+
+def test_write_pak_matches_repak(scam, tmp_path):
+    output = tmp_path / 'out.pak'
+    scam.write_pak(output, {scam.MOD_CFG_PATH: (FIXTURES / 'SCAM.cfg').read_bytes()})
+    assert output.read_bytes() == (FIXTURES / 'repak_v8b.pak').read_bytes()
+
+
+def test_write_pak_streamed_matches_repak(scam, tmp_path):
+    data = (FIXTURES / 'SCAM.cfg').read_bytes()
+    output = tmp_path / 'out.pak'
+    scam.write_pak(output, {scam.MOD_CFG_PATH: iter([data[:100], data[100:]])})
+    assert output.read_bytes() == (FIXTURES / 'repak_v8b.pak').read_bytes()
+
+
+def test_reader_reads_repak_pak(scam):
+    with scam.PakReader(FIXTURES / 'repak_v8b.pak') as pak:
+        assert list(pak.entries) == [scam.MOD_CFG_PATH]
+        assert pak.read(scam.MOD_CFG_PATH) == (FIXTURES / 'SCAM.cfg').read_bytes()
@@ -0,0 +1,52 @@
+# repak_v11.pak and repak_v11_zlib.pak were written by repak (the repak 0.2.3 crate through its
+# Python bindings) as V11 paks, with the path hash and full directory index, holding
+# tests/fixtures/SCAM.cfg uncompressed and zlib compressed.
+import struct
+
+import pytest
+
+from conftest import FIXTURES
+
+
+@pytest.mark.parametrize('name', ['repak_v8b.pak', 'repak_v11.pak', 'repak_v11_zlib.pak'])
+def test_reads_repak_paks(scam, name):
+    with scam.PakReader(FIXTURES / name) as pak:
+        assert list(pak.entries) == [scam.MOD_CFG_PATH]
+        assert pak.read(scam.MOD_CFG_PATH) == (FIXTURES / 'SCAM.cfg').read_bytes()
+
+
+def test_read_mod_config(scam):
+    config = scam.read_mod_config(FIXTURES / 'repak_v11_zlib.pak')
+    assert config['MovementParams']['WalkSpeed'] == 200
+    assert config['MovementParams']['AirControlCoef'] == 0.3
+    assert config['VaultingParams']['StartWithSprintPressed'] is True
+
+
+def corrupt_entry_offset(scam, path):
+    # Point the only index record of a V8B pak past the end of the file
+    data = bytearray((FIXTURES / 'repak_v8b.pak').read_bytes())
+    index_offset, = struct.unpack_from('<Q', data, len(data) - 221 + 25)
+    record = index_offset + len(scam.pak_string(scam.PAK_MOUNT_POINT)) + 4 + len(scam.pak_string(scam.MOD_CFG_PATH))
+    struct.pack_into('<Q', data, record, 1 << 40)
+    path.write_bytes(bytes(data))
+
+
+def test_corrupt_entry_raises_value_error(scam, tmp_path):
+    corrupt_entry_offset(scam, tmp_path / 'bad.pak')
+    with scam.PakReader(tmp_path / 'bad.pak') as pak:
+        with pytest.raises(ValueError):
+            pak.read(scam.MOD_CFG_PATH)
+    with pytest.raises(ValueError):
+        scam.read_mod_config(tmp_path / 'bad.pak')
+
+
+def test_scan_skips_corrupt_pak(scam, tmp_path):
+    mods = tmp_path / 'mods'
+    mods.mkdir()
+    corrupt_entry_offset(scam, mods / 'a_bad_P.pak')
+    (mods / 'b_good_P.pak').write_bytes((FIXTURES / 'repak_v8b.pak').read_bytes())
+    records = scam.scan_mods(mods, cache_file=tmp_path / 'scan.json')
+    bad, good = [records[str(mods / name)] for name in ['a_bad_P.pak', 'b_good_P.pak']]
+    assert bad['error']
+    assert not good['error']
+    assert 'Player/MovementParams/WalkSpeed' in good['keys']
@@ -0,0 +1,81 @@
+import shutil
+
+import pytest
+
+from conftest import FIXTURES
+
+
+@pytest.fixture
+def presets(tmp_path):
+    directory = tmp_path / 'presets'
+    shutil.copytree(FIXTURES / 'presets', directory)
+    return directory
+
+
+@pytest.fixture
+def resolver(scam, schema, presets):
+    return scam.PresetResolver(search_dirs=(str(presets),), schema=schema)
+
+
+def test_parents_merge_in_order_then_own_values(resolver):
+    combo2 = resolver.resolve('combo2')
+    # b comes after a, so its turn rate wins; combo2's own angle wins over b's
+    assert combo2['MovementParams'] == {'BaseTurnRate': 90, 'BaseLookUpRate': 40, 'WalkSpeed': 200,
+                                        'RunSpeed': 400}
+    assert combo2['VaultingParams'] == {'MaxAngle': 95, 'MaxTestDistance': 15}
+    assert combo2['Aiming'] == {'SyncTurnRate': True}
+    assert 'Preset' not in combo2
+
+
+def test_later_parent_wins(resolver, presets):
+    (presets / 'reversed.ini').write_text('[Preset]\nParents = b, a\n')
+    assert resolver.resolve('reversed')['MovementParams']['BaseTurnRate'] == 40
+
+
+@pytest.mark.parametrize('layers', [
+    {'loop': 'loop'},
+    {'loop': 'other', 'other': 'loop'},
+    {'loop': 'a, middle', 'middle': 'combo, loop'},
+])
+def test_cycles_are_rejected(resolver, presets, layers):
+    for name, parents in layers.items():
+        (presets / f'{name}.ini').write_text(f'[Preset]\nParents = {parents}\n')
+    with pytest.raises(ValueError, match='layered on itself'):
+        resolver.resolve('loop')
+
+
+def test_missing_parent(resolver, presets):
+    (presets / 'orphan.ini').write_text('[Preset]\nParents = nowhere\n')
+    with pytest.raises(ValueError, match="'nowhere' not found"):
+        resolver.resolve('orphan')
+
+
+def test_invalidate_cascades_to_children(resolver, presets):
+    resolver.resolve('combo2')
+    resolver.resolve('b')
+    (presets / 'a.ini').write_text('[MovementParams]\nBaseLookUpRate = 55\n')
+
+    resolver.invalidate(['a'])
+    assert set(resolver.resolved) == {'b'}
+    assert resolver.resolve('combo2')['MovementParams']['BaseLookUpRate'] == 55
+    assert 'Aiming' not in resolver.resolve('combo')
+
+
+def test_layer_overrides_resolve_back_to_config(scam, schema, resolver, presets):
+    default_config, _ = schema.defaults()
+    config = {'MovementParams': {'BaseTurnRate': 90, 'BaseLookUpRate': 70, 'WalkSpeed': 200},
+              'VaultingParams': {'MaxAngle': 120}}
+    base = resolver.resolve_parents('layered', ['combo'])
+    layer = scam.layer_overrides(config, base, default_config)
+    # Inherited values are not repeated, and a value put back to its default overrides the parent
+    assert layer['MovementParams'] == {'BaseLookUpRate': 70,
+                                       'RunSpeed': default_config['MovementParams']['RunSpeed']}
+    assert layer['VaultingParams'] == {'MaxAngle': 120}
+
+    layer[scam.PRESET_META_SECTION] = {'Parents': 'combo'}
+    with open(presets / 'layered.ini', 'w') as f:
+        for section, values in layer.items():
+            f.write(f'[{section}]\n' + ''.join(f'{key} = {scam.format_value(value)}\n'
+                                               for key, value in values.items()))
+    resolved = resolver.resolve('layered')
+    assert scam.compute_overrides(default_config, resolved) == scam.compute_overrides(default_config, config)
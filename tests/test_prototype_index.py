@@ -0,0 +1,70 @@
+import os
+import shutil
+
+import pytest
+
+from conftest import FIXTURES
+
+GAME_DATA = 'Stalker2/Content/GameLite/GameData'
+
+
+@pytest.fixture
+def game(tmp_path, monkeypatch):
+    # game_defaults keeps one index per index file name, relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    shutil.copytree(FIXTURES / 'game', tmp_path / 'game')
+    return tmp_path / 'game'
+
+
+def test_refkey_inherits_across_refurl(scam, game):
+    index = scam.PrototypeIndex()
+    custom = index.resolve(game / GAME_DATA / 'ObjPrototypes' / 'CustomPlayer.cfg', 'CustomPlayer')
+    # CustomPlayer -> Player (through refurl) -> BaseCharacter, nested structs merged key by key
+    assert custom['MovementParams'] == {'WalkSpeed': '222.5f', 'RunSpeed': '350.5f', 'BaseTurnRate': '60',
+                                        'Limits': {'MaxSlope': '45.f'}}
+    assert custom['VaultingParams'] == {'MaxAngle': '160.f', 'MinObstacleHeight': '50'}
+
+
+def test_array_refkeys_are_not_followed(scam, game):
+    index = scam.PrototypeIndex()
+    assert index.resolve(game / GAME_DATA / 'ObjPrototypes.cfg', 'Effect') == {'Own': '2'}
+
+
+def test_unknown_prototype(scam, game):
+    with pytest.raises(KeyError):
+        scam.PrototypeIndex().resolve(game / GAME_DATA / 'ObjPrototypes.cfg', 'Nobody')
+
+
+def test_base_change_is_picked_up(scam, game):
+    index = scam.PrototypeIndex()
+    base = game / GAME_DATA / 'ObjPrototypes.cfg'
+    custom = game / GAME_DATA / 'ObjPrototypes' / 'CustomPlayer.cfg'
+    assert index.resolve(custom, 'CustomPlayer')['MovementParams']['WalkSpeed'] == '222.5f'
+
+    # Same size, so only the mtime tells the edit apart
+    stat = base.stat()
+    base.write_bytes(base.read_bytes().replace(b'222.5f', b'233.5f'))
+    os.utime(base, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert index.resolve(custom, 'CustomPlayer')['MovementParams']['WalkSpeed'] == '233.5f'
+
+
+def test_index_is_reused_until_cfg_changes(scam, game, monkeypatch):
+    base = game / GAME_DATA / 'ObjPrototypes.cfg'
+    scam.PrototypeIndex().resolve(base, 'Player')
+
+    def no_scan(data):
+        raise AssertionError("cfg scanned again")
+    monkeypatch.setattr(scam.PrototypeIndex, 'scan', staticmethod(no_scan))
+    assert scam.PrototypeIndex().resolve(base, 'Player')['MovementParams']['WalkSpeed'] == '222.5f'
+
+
+def test_game_defaults_strip_float_suffix(scam, schema, game, monkeypatch):
+    monkeypatch.setattr(scam, '_prototype_indexes', {})
+    defaults = scam.game_defaults(str(game), schema)
+    assert defaults[('MovementParams', 'WalkSpeed')] == 222.5
+    assert defaults[('MovementParams', 'RunSpeed')] == 300
+    assert defaults[('MovementParams', 'BaseTurnRate')] == 60
+    assert defaults[('VaultingParams', 'MaxAngle')] == 160
+    assert defaults[('VaultingParams', 'MinObstacleHeight')] == 50
+    # Settings the prototype doesn't define keep default_values.ini's
+    assert ('StaminaPerAction', 'Jump') not in defaults
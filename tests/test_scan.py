@@ -0,0 +1,53 @@
+import pytest
+
+WALK = 'Player/MovementParams/WalkSpeed'
+
+
+@pytest.fixture
+def mods(scam, tmp_path):
+    directory = tmp_path / 'mods'
+    directory.mkdir()
+    scam.pack_mod({'MovementParams': {'WalkSpeed': 250, 'RunSpeed': 300}}, directory / 'Z_Other.pak')
+    scam.pack_mod({'MovementParams': {'WalkSpeed': 150}}, directory / 'a_base.pak')
+    scam.pack_mod({'MovementParams': {'WalkSpeed': 200, 'BaseTurnRate': 50}}, directory / 'y_mine.pak')
+    return directory
+
+
+def test_conflicts_follow_case_insensitive_load_order(scam, mods, tmp_path):
+    records = scam.scan_mods(mods, cache_file=tmp_path / 'scan.json')
+    order = [str(mods / name) for name in ['a_base.pak', 'y_mine.pak', 'Z_Other.pak']]
+    conflicts = {key: (paks, winner) for key, paks, winner in scam.find_conflicts(records, order[1])}
+
+    # Z_Other sorts after y_mine, so it mounts later and wins
+    assert conflicts[WALK] == (order, order[2])
+    assert conflicts[scam.MOD_CFG_PATH] == (order, order[2])
+    assert 'Player/MovementParams/BaseTurnRate' not in conflicts
+    assert 'Player/MovementParams/RunSpeed' not in conflicts
+
+
+def test_last_pak_wins_its_own_conflicts(scam, mods, tmp_path):
+    records = scam.scan_mods(mods, cache_file=tmp_path / 'scan.json')
+    target = str(mods / 'Z_Other.pak')
+    conflicts = scam.find_conflicts(records, target)
+    assert sorted(key for key, _, _ in conflicts) == sorted([WALK, scam.MOD_CFG_PATH])
+    for key, paks, winner in conflicts:
+        assert paks[-1] == winner == target
+
+
+def test_scan_cache_is_reused_and_written_atomically(scam, mods, tmp_path, monkeypatch):
+    cache_file = tmp_path / 'scan.json'
+    records = scam.scan_mods(mods, cache_file=cache_file)
+    assert scam.read_json(cache_file) == records
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith('.tmp')] == []
+
+    def no_scan(path):
+        raise AssertionError(f"{path} scanned again")
+    monkeypatch.setattr(scam, 'scan_pak', no_scan)
+    assert scam.scan_mods(mods, cache_file=cache_file) == records
+
+
+def test_unreadable_cache_is_ignored(scam, mods, tmp_path):
+    cache_file = tmp_path / 'scan.json'
+    cache_file.write_text('{"truncated": ')
+    assert scam.read_json(cache_file) == {}
+    assert len(scam.scan_mods(mods, cache_file=cache_file)) == 3
@@ -0,0 +1,46 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+TURN = ('MovementParams', 'BaseTurnRate')
+AIR = ('MovementParams', 'AirControlCoef')
+MIN_HEIGHT = ('VaultingParams', 'MinObstacleHeight')
+MAX_HEIGHT = ('VaultingParams', 'MaxObstacleHeight')
+
+
+@pytest.fixture
+def base_config(schema):
+    return schema.defaults()[0]
+
+
+def test_grid_holds_every_combination(scam):
+    grid = scam.sweep_grid([[30, 40], [0.1, 0.2, 0.3]])
+    assert grid.shape == (6, 2)
+    assert {tuple(row) for row in grid.tolist()} == {(t, a) for t in [30, 40] for a in [0.1, 0.2, 0.3]}
+
+
+def test_parse_sweep_param_includes_stop(scam, schema):
+    assert scam.parse_sweep_param('MovementParams.BaseTurnRate=30:80:10', schema) == (
+        TURN, [30, 40, 50, 60, 70, 80])
+    with pytest.raises(ValueError):
+        scam.parse_sweep_param('MovementParams.BaseTurnRate=1:2:0', schema)
+
+
+def test_range_and_integer_masks(scam, base_config):
+    grid = np.array([
+        [40, 0.5],
+        [40.5, 0.5],    # turn rate has to be a whole number
+        [-10, 0.5],     # sweeps stay non-negative
+        [40, 1.5],      # coefficients are capped at 1 in sweeps
+        [np.nan, 0.5],
+    ])
+    assert scam.validate_sweep([TURN, AIR], grid, base_config).tolist() == [True, False, False, False, False]
+
+
+def test_cross_field_mask_uses_base_for_unswept_field(scam, base_config):
+    # MaxObstacleHeight is not swept, so the base config's 130 bounds the minimum
+    grid = np.array([[70], [130], [131]])
+    assert scam.validate_sweep([MIN_HEIGHT], grid, base_config).tolist() == [True, True, False]
+
+    both = np.array([[50, 200], [200, 50]])
+    assert scam.validate_sweep([MIN_HEIGHT, MAX_HEIGHT], both, base_config).tolist() == [True, False]
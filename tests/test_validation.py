@@ -0,0 +1,49 @@
+import pytest
+
+
+def test_values_without_a_hard_limit_stay_allowed(scam, schema):
+    # Coefficients above 1 and negative offsets are fine in game, only sweeps cap them
+    preset = {'MovementParams': {'JumpSpeedCoef': 1.2, 'ClimbSpeedCoef': 1.5},
+              'VaultingParams': {'VaultOverLandOffset': -10}}
+    assert schema.invalid_fields(preset) == []
+    default_config, _ = schema.defaults()
+    assert scam.compute_overrides(default_config, preset, schema) == preset
+
+
+@pytest.mark.parametrize('use_schema', [True, False])
+def test_flags_have_to_be_true_or_false(scam, schema, use_schema):
+    default_config, _ = schema.defaults()
+    checked = schema if use_schema else None
+    assert scam.compute_overrides(default_config, {'VaultingParams': {'StartWithSprintPressed': True}}, checked) == {
+        'VaultingParams': {'StartWithSprintPressed': True}}
+    assert scam.compute_overrides(default_config, {'VaultingParams': {'StartWithSprintPressed': 'TRUE'}}, checked) == {
+        'VaultingParams': {'StartWithSprintPressed': True}}
+    with pytest.raises(ValueError, match='StartWithSprintPressed'):
+        scam.compute_overrides(default_config, {'VaultingParams': {'StartWithSprintPressed': 'yes'}}, checked)
+
+
+def test_hard_limits(schema):
+    assert schema.invalid_fields({'VaultingParams': {'MaxAngle': 200, 'MinForwardAxisInputValue': 0.5}}) == [
+        ('VaultingParams', 'MaxAngle')]
+
+
+@pytest.mark.parametrize('text, value', [('1e-3', 0.001), ('5.', 5.0), ('-10', -10), ('160.5', 160.5)])
+def test_number_parsing(schema, text, value):
+    assert schema.validators[('MovementParams', 'WalkSpeed')].validate(text) == value
+
+
+@pytest.mark.parametrize('text', ['abc', '', 'inf', 'nan', '1e999'])
+def test_rejects_non_numbers(schema, text):
+    assert schema.validators[('MovementParams', 'WalkSpeed')].validate(text) is None
+
+
+def test_integer_fields(schema):
+    validator = schema.validators[('MovementParams', 'BaseTurnRate')]
+    assert validator.validate('40') == 40
+    assert validator.validate('40.5') is None
+
+
+def test_cfg_floats_in_plain_notation(scam):
+    assert scam.format_value(0.00001) == '0.00001'
+    assert scam.format_value(0.3) == '0.3'
+    assert scam.format_value(1.0) == '1.0'
@@ -0,0 +1,89 @@
+import os
+import shutil
+
+import pytest
+
+from conftest import ROOT
+
+
+@pytest.fixture
+def workdir(scam, tmp_path, monkeypatch):
+    # WatchBuild reads default_ini/ and custom_ini/ from the working directory like the app does
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv(scam.GAME_DATA_ENV, raising=False)
+    (tmp_path / 'default_ini').mkdir()
+    shutil.copy(ROOT / scam.DEFAULT_INI, tmp_path / scam.DEFAULT_INI)
+    (tmp_path / scam.PRESET_DIR).mkdir()
+    return tmp_path
+
+
+def write_preset(workdir, scam, text, name='mine'):
+    (workdir / scam.PRESET_DIR / f'{name}.ini').write_text(text)
+    return str(workdir / scam.PRESET_DIR / f'{name}.ini')
+
+
+def test_build_deploys_then_skips_unchanged(scam, workdir):
+    path = write_preset(workdir, scam, '[MovementParams]\nWalkSpeed = 200\n')
+    build = scam.WatchBuild('mine', str(workdir / 'mods'))
+    assert build.build() == 'deployed'
+    assert build.build() == 'unchanged'
+
+    write_preset(workdir, scam, '[MovementParams]\nWalkSpeed = 250\n')
+    build.changed({path})
+    assert build.build() == 'deployed'
+    assert scam.read_mod_config(build.output) == {'MovementParams': {'WalkSpeed': 250}}
+    assert os.listdir(workdir / 'mods') == [f'{scam.MOD_NAME}.pak']
+
+
+def test_back_to_defaults_removes_deployed_pak(scam, workdir):
+    path = write_preset(workdir, scam, '[MovementParams]\nWalkSpeed = 200\n')
+    build = scam.WatchBuild('mine', str(workdir / 'mods'))
+    assert build.build() == 'deployed'
+
+    write_preset(workdir, scam, '[MovementParams]\nWalkSpeed = 160\n')
+    build.changed({path})
+    assert build.build() == 'empty'
+    assert os.listdir(workdir / 'mods') == []
+
+    # The same config as before has to be deployed again, not reported as unchanged
+    write_preset(workdir, scam, '[MovementParams]\nWalkSpeed = 200\n')
+    build.changed({path})
+    assert build.build() == 'deployed'
+    assert os.path.exists(build.output)
+
+
+def test_invalid_values_keep_deployed_pak(scam, workdir):
+    path = write_preset(workdir, scam, '[VaultingParams]\nMaxAngle = 100\n')
+    build = scam.WatchBuild('mine', str(workdir / 'mods'))
+    build.build()
+    deployed = open(build.output, 'rb').read()
+
+    write_preset(workdir, scam, '[VaultingParams]\nMaxAngle = 200\n')
+    build.changed({path})
+    with pytest.raises(ValueError, match='VaultingParams.MaxAngle'):
+        build.build()
+    assert open(build.output, 'rb').read() == deployed
+
+
+def test_poll_waits_for_changes_to_settle(scam, workdir, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(scam.time, 'monotonic', lambda: clock[0])
+    watcher = scam.PresetWatcher(directories=(scam.PRESET_DIR,), debounce=0.5)
+    assert watcher.poll() == set()
+
+    path = write_preset(workdir, scam, '[MovementParams]\nWalkSpeed = 200\n')
+    assert watcher.poll() == set()
+    # A second write restarts the quiet period
+    clock[0] += 0.25
+    write_preset(workdir, scam, '[MovementParams]\nWalkSpeed = 2000\n')
+    assert watcher.poll() == set()
+    clock[0] += 0.25
+    assert watcher.poll() == set()
+    clock[0] += 0.25
+    assert watcher.poll() == {path}
+    assert watcher.poll() == set()
+
+    os.remove(path)
+    assert watcher.poll() == set()
+    clock[0] += 0.5
+    assert watcher.poll() == {path}